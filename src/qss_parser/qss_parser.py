@@ -1,12 +1,20 @@
+import copy
 import logging
 import re
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
 from typing import (
+    Any,
     Callable,
+    ClassVar,
     Dict,
     Final,
+    FrozenSet,
     List,
     Match,
     Optional,
@@ -26,28 +34,87 @@ class Constants:
     and pseudo-states used in Qt Style Sheets (QSS).
 
     Attributes:
+        INTERN_VALUE_MAX_LENGTH (int): Property values shorter than this are interned.
         ATTRIBUTE_PATTERN (str): Regular expression pattern for matching QSS attribute selectors.
         COMPILED_ATTRIBUTE_PATTERN (Pattern[str]): Compiled version of ATTRIBUTE_PATTERN for better performance.
         VARIABLE_PATTERN (str): Regular expression pattern for matching QSS variable declarations.
+        COMPILED_VARIABLE_PATTERN (Pattern[str]): Compiled version of VARIABLE_PATTERN.
         COMPLETE_RULE_PATTERN (str): Regular expression pattern for matching complete QSS rules.
+        COMPILED_COMPLETE_RULE_PATTERN (Pattern[str]): Compiled version of COMPLETE_RULE_PATTERN.
+        COMPILED_COMPLETE_RULE_PARTS_PATTERN (Pattern[str]): Matches a complete rule,
+            capturing its selector and its properties.
+        COMPILED_PROPERTY_NAME_PATTERN (Pattern[str]): Matches a valid property name.
+        COMPILED_QPROPERTY_NAME_PATTERN (Pattern[str]): Matches a valid "qproperty-"
+            property name.
         PSEUDO_PATTERN (str): Regular expression pattern for matching pseudo-elements and pseudo-states.
+        COMPILED_PSEUDO_PATTERN (Pattern[str]): Compiled version of PSEUDO_PATTERN.
         CLASS_ID_PATTERN (str): Regular expression pattern for matching class and ID combinations.
+        COMPILED_CLASS_ID_PATTERN (Pattern[str]): Compiled version of CLASS_ID_PATTERN.
         COMBINATOR_PATTERN (str): Regular expression pattern for matching QSS combinators.
+        COMPILED_COMBINATOR_PATTERN (Pattern[str]): Compiled version of COMBINATOR_PATTERN.
+        COMPILED_EMPTY_ATTRIBUTE_VALUE_PATTERN (Pattern[str]): Matches attribute selectors
+            with an operator but no value, such as "[prop=]".
+        COMPILED_PSEUDO_SPACING_PATTERN (Pattern[str]): Matches whitespace before a pseudo colon.
+        COMPILED_PSEUDO_ELEMENT_PATTERN (Pattern[str]): Matches "::name" pseudo-elements.
+        COMPILED_SELECTOR_TOKEN_PATTERN (Pattern[str]): Splits a selector into
+            attribute, child combinator, whitespace, ID, word and other tokens
+            in a single scan.
+        COMPILED_COMMENT_PATTERN (Pattern[str]): Matches a complete, possibly multi-line,
+            block comment.
+        COMPILED_LINE_PATTERN (Pattern[str]): Matches one line of text including its
+            line terminator, used to iterate lines without splitting the whole text.
+        SELECTOR_BOUNDARY_CHARS (FrozenSet[str]): Characters that end a selector
+            prefix for style lookups: pseudo colon, space, attribute or child
+            combinator.
         PSEUDO_ELEMENTS (List[str]): List of valid QSS pseudo-elements.
         PSEUDO_STATES (List[str]): List of valid QSS pseudo-states.
+        PSEUDO_ELEMENTS_SET (FrozenSet[str]): PSEUDO_ELEMENTS as a set for fast lookups.
+        PSEUDO_STATES_SET (FrozenSet[str]): PSEUDO_STATES as a set for fast lookups.
     """
 
+    INTERN_VALUE_MAX_LENGTH: Final[int] = 64
     ATTRIBUTE_PATTERN: Final[str] = (
         r'\[\w+(?:(?:~|=|\|=|\^=|\$=|\*=)(?:"[^"]*"|[^\s"\]]*))?[^[]*\]'
     )
     COMPILED_ATTRIBUTE_PATTERN: Final[Pattern[str]] = re.compile(ATTRIBUTE_PATTERN)
     VARIABLE_PATTERN: Final[str] = r"var\((--[\w-]+)\)"
+    COMPILED_VARIABLE_PATTERN: Final[Pattern[str]] = re.compile(VARIABLE_PATTERN)
     COMPLETE_RULE_PATTERN: Final[str] = r"^\s*[^/][^{}]*\s*\{[^}]*\}\s*$"
+    COMPILED_COMPLETE_RULE_PATTERN: Final[Pattern[str]] = re.compile(
+        COMPLETE_RULE_PATTERN
+    )
+    COMPILED_COMPLETE_RULE_PARTS_PATTERN: Final[Pattern[str]] = re.compile(
+        r"^\s*([^/][^{}]*)\s*\{([^}]*)\}\s*$"
+    )
+    COMPILED_PROPERTY_NAME_PATTERN: Final[Pattern[str]] = re.compile(
+        r"^[a-zA-Z][a-zA-Z0-9-]*$"
+    )
+    COMPILED_QPROPERTY_NAME_PATTERN: Final[Pattern[str]] = re.compile(
+        r"^qproperty-[a-zA-Z_][a-zA-Z0-9_-]*$"
+    )
     PSEUDO_PATTERN: Final[str] = r"(\w+|#[-\w]+|\[.*?\])\s*(:{1,2})\s*([-\w]+)"
+    COMPILED_PSEUDO_PATTERN: Final[Pattern[str]] = re.compile(PSEUDO_PATTERN)
     CLASS_ID_PATTERN: Final[str] = r"(\w+)(#[-\w]+)"
+    COMPILED_CLASS_ID_PATTERN: Final[Pattern[str]] = re.compile(CLASS_ID_PATTERN)
     COMBINATOR_PATTERN: Final[str] = (
         r"(\w+|#[-\w]+|\[.*?\])([> ]{1,2})(\w+|#[-\w]+|\[.*?\])"
     )
+    COMPILED_COMBINATOR_PATTERN: Final[Pattern[str]] = re.compile(COMBINATOR_PATTERN)
+    COMPILED_EMPTY_ATTRIBUTE_VALUE_PATTERN: Final[Pattern[str]] = re.compile(
+        r"\[\w+(?:~|=|\|=|\^=|\$=|\*=)\]"
+    )
+    COMPILED_PSEUDO_SPACING_PATTERN: Final[Pattern[str]] = re.compile(r"\s+:{1,2}\s*")
+    COMPILED_PSEUDO_ELEMENT_PATTERN: Final[Pattern[str]] = re.compile(r"::\w+")
+    COMPILED_SELECTOR_TOKEN_PATTERN: Final[Pattern[str]] = re.compile(
+        rf"(?P<attribute>{ATTRIBUTE_PATTERN})|(?P<child>\s*>\s*)|(?P<space>\s+)"
+        rf"|(?P<id>#(?:[-\w]|{ATTRIBUTE_PATTERN})+)|(?P<word>\w+)|(?P<other>.)",
+        re.DOTALL,
+    )
+    COMPILED_COMMENT_PATTERN: Final[Pattern[str]] = re.compile(r"/\*.*?\*/", re.DOTALL)
+    COMPILED_LINE_PATTERN: Final[Pattern[str]] = re.compile(
+        r"[^\r\n]*(?:\r\n?|\n)|[^\r\n]+"
+    )
+    SELECTOR_BOUNDARY_CHARS: Final[FrozenSet[str]] = frozenset(": [>")
 
     PSEUDO_ELEMENTS: Final[List[str]] = [
         "::add-line",
@@ -133,6 +200,8 @@ class Constants:
         ":vertical",
         ":window",
     ]
+    PSEUDO_ELEMENTS_SET: Final[FrozenSet[str]] = frozenset(PSEUDO_ELEMENTS)
+    PSEUDO_STATES_SET: Final[FrozenSet[str]] = frozenset(PSEUDO_STATES)
 
 
 class MetaObjectProtocol(Protocol):
@@ -210,28 +279,37 @@ class QSSPropertyDict(TypedDict):
     value: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class QSSProperty:
     """
     A dataclass representing a QSS property with its name and value.
 
     This class handles the storage and formatting of individual QSS properties,
-    ensuring proper string formatting and dictionary conversion.
+    ensuring proper string formatting and dictionary conversion. Properties are
+    immutable and hashable; rules replace a property to change its value.
 
     Attributes:
         name (str): The name of the QSS property.
         value (str): The value of the QSS property.
     """
 
+    __slots__ = ("name", "value")
+
     name: str
     value: str
 
     def __post_init__(self) -> None:
         """
         Post-initialization hook that strips whitespace from name and value.
+
+        Names and short values are interned, since the same strings repeat
+        across the rules of a stylesheet.
         """
-        object.__setattr__(self, "name", self.name.strip())
-        object.__setattr__(self, "value", self.value.strip())
+        value = self.value.strip()
+        if len(value) < Constants.INTERN_VALUE_MAX_LENGTH:
+            value = sys.intern(value)
+        object.__setattr__(self, "name", sys.intern(self.name.strip()))
+        object.__setattr__(self, "value", value)
 
     def __repr__(self) -> str:
         """
@@ -251,6 +329,27 @@ class QSSProperty:
         """
         return {"name": self.name, "value": self.value}
 
+    def __reduce__(self) -> Tuple[Any, Tuple[str, str]]:
+        """
+        Support pickling and copying by rebuilding from name and value.
+
+        Returns:
+            Tuple[Any, Tuple[str, str]]: The class and its constructor arguments.
+        """
+        return (QSSProperty, (self.name, self.value))
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "QSSProperty":
+        """
+        Return the property itself, since it is immutable.
+
+        Args:
+            memo (Dict[int, Any]): The deepcopy memo dictionary.
+
+        Returns:
+            QSSProperty: This property.
+        """
+        return self
+
 
 class QSSRule:
     """
@@ -266,8 +365,30 @@ class QSSRule:
         class_name (Optional[str]): The class name extracted from the selector.
         attributes (List[str]): List of attributes extracted from the selector.
         pseudo_states (List[str]): List of pseudo-states extracted from the selector.
+        _version (int): Counter advanced whenever the selector or properties of
+            this rule change, compared by caches of output built from the rule.
+        _on_change (Optional[Callable[[], None]]): Called after the rule changes,
+            set by the parser holding the rule to update its own caches.
+        _name_index (Dict[str, int]): Maps each property name to its position in
+            properties, maintained by add_property and merge_properties.
+        _name_index_version (int): Value of _version _name_index is valid for.
     """
 
+    __slots__ = (
+        "_selector",
+        "_properties",
+        "object_name",
+        "class_name",
+        "_attributes",
+        "pseudo_states",
+        "_formatted",
+        "_formatted_version",
+        "_version",
+        "_on_change",
+        "_name_index",
+        "_name_index_version",
+    )
+
     def __init__(self, selector: str) -> None:
         """
         Initialize a QSS rule with the given selector.
@@ -275,25 +396,121 @@ class QSSRule:
         Args:
             selector (str): The CSS selector for this rule.
         """
-        self.selector: str = SelectorUtils.strip_comments(selector).strip()
-        self.properties: List[QSSProperty] = []
+        self._selector: str = sys.intern(SelectorUtils.strip_comments(selector))
+        self._properties: List[QSSProperty] = []
         self.object_name: Optional[str] = None
         self.class_name: Optional[str] = None
-        self.attributes: List[str] = []
+        self._attributes: Tuple[str, ...] = ()
         self.pseudo_states: List[str] = []
+        self._formatted: Optional[str] = None
+        self._formatted_version: int = -1
+        self._version: int = 0
+        self._on_change: Optional[Callable[[], None]] = None
+        self._name_index: Dict[str, int] = {}
+        self._name_index_version: int = 0
         self._parse_selector()
 
+    def _record_change(self) -> None:
+        """
+        Advance the rule's version after its selector or properties change.
+        """
+        self._version += 1
+        if self._on_change is not None:
+            self._on_change()
+
+    def mark_changed(self) -> None:
+        """
+        Record that the properties list was changed in place.
+
+        Changes made through the rule's methods and setters are tracked
+        automatically. Appending to, replacing or removing items of the
+        properties list directly is not, so call this method afterwards to
+        rebuild output cached from the rule.
+        """
+        self._record_change()
+
+    @property
+    def selector(self) -> str:
+        """
+        The selector of the rule.
+
+        Returns:
+            str: The selector.
+        """
+        return self._selector
+
+    @selector.setter
+    def selector(self, selector: str) -> None:
+        """
+        Set the selector of the rule.
+
+        Args:
+            selector (str): The new selector.
+        """
+        self._selector = selector
+        self._record_change()
+
+    @property
+    def properties(self) -> List[QSSProperty]:
+        """
+        The properties of the rule, in declaration order.
+
+        Returns:
+            List[QSSProperty]: The properties list. Call mark_changed after
+                changing it in place.
+        """
+        return self._properties
+
+    @properties.setter
+    def properties(self, properties: List[QSSProperty]) -> None:
+        """
+        Replace the properties of the rule.
+
+        Args:
+            properties (List[QSSProperty]): The new properties.
+        """
+        self._properties = properties
+        self._record_change()
+
     def _parse_selector(self) -> None:
         """
         Parse the selector to extract object name, class name, attributes,
         and pseudo-states.
+
+        Names and pseudo-states are interned like the selector, since the
+        same few widget classes and states recur across a stylesheet.
         """
-        (
-            self.object_name,
-            self.class_name,
-            self.attributes,
-            self.pseudo_states,
-        ) = SelectorUtils.parse_selector(self.selector)
+        object_name, class_name, attributes, pseudo_states = (
+            SelectorUtils.parse_selector(self.selector)
+        )
+        self.object_name = sys.intern(object_name) if object_name else object_name
+        self.class_name = sys.intern(class_name) if class_name else class_name
+        self.pseudo_states = [sys.intern(state) for state in pseudo_states]
+        if attributes:
+            self._attributes = tuple(attributes)
+
+    @property
+    def attributes(self) -> List[str]:
+        """
+        List of attribute selectors extracted from the selector.
+
+        Attributes are stored as a tuple, shared as the empty tuple by the
+        majority of rules that have none, and only turned into a list on access.
+
+        Returns:
+            List[str]: The attribute selectors, in selector order.
+        """
+        return list(self._attributes)
+
+    @attributes.setter
+    def attributes(self, attributes: List[str]) -> None:
+        """
+        Set the attribute selectors of the rule.
+
+        Args:
+            attributes (List[str]): The attribute selectors.
+        """
+        self._attributes = tuple(attributes)
 
     def add_property(self, name: str, value: str) -> None:
         """
@@ -303,7 +520,70 @@ class QSSRule:
             name (str): The name of the property.
             value (str): The value of the property.
         """
-        self.properties.append(QSSProperty(name, value))
+        index_is_current = self._name_index_version == self._version
+        self._properties.append(QSSProperty(name, value))
+        self._record_change()
+        if index_is_current and name not in self._name_index:
+            self._name_index[name] = len(self._properties) - 1
+            self._name_index_version = self._version
+
+    def _get_name_index(self) -> Dict[str, int]:
+        """
+        Get the name index, rebuilding it if the properties changed otherwise.
+
+        The index is rebuilt after a duplicate name was added or the
+        properties were replaced or marked as changed. Duplicate names are
+        collapsed while rebuilding, keeping the first position and last value.
+
+        Returns:
+            Dict[str, int]: The position of each property name.
+        """
+        if self._name_index_version != self._version:
+            prop_map = {p.name: p for p in self._properties}
+            if len(prop_map) != len(self._properties):
+                self._properties = list(prop_map.values())
+            self._name_index = {name: i for i, name in enumerate(prop_map)}
+            self._name_index_version = self._version
+        return self._name_index
+
+    def merge_properties(self, properties: List[QSSProperty]) -> None:
+        """
+        Merge properties into the rule, replacing values of existing names.
+
+        Properties with a name already present keep their position and take
+        the new value; other properties are appended. Duplicate names already
+        in the rule are collapsed, keeping the last value. Positions are looked
+        up in the name index, so each merged property costs O(1).
+
+        Args:
+            properties (List[QSSProperty]): The properties to merge.
+        """
+        name_index = self._get_name_index()
+        current = self._properties
+        for prop in properties:
+            position = name_index.get(prop.name)
+            if position is None:
+                name_index[prop.name] = len(current)
+                current.append(prop)
+            else:
+                current[position] = prop
+        self._record_change()
+        self._name_index_version = self._version
+
+    def to_string(self) -> str:
+        """
+        Get the rule formatted as QSS.
+
+        The formatted string is kept until the selector or properties of the
+        rule change, as tracked by the rule's version.
+
+        Returns:
+            str: The rule formatted by QSSFormatter.format_rule.
+        """
+        if self._formatted is None or self._formatted_version != self._version:
+            self._formatted = QSSFormatter.format_rule(self.selector, self.properties)
+            self._formatted_version = self._version
+        return self._formatted
 
     def clone_without_pseudo_elements(self) -> "QSSRule":
         """
@@ -318,6 +598,28 @@ class QSSRule:
         clone.properties = self.properties.copy()
         return clone
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "QSSRule":
+        """
+        Copy the rule for a parse cache snapshot.
+
+        Properties and the selector data are immutable or only replaced, so
+        only the containers that are changed in place are copied. The cached
+        formatted string is kept, while the copy is not tied to any parser.
+
+        Args:
+            memo (Dict[int, Any]): The deepcopy memo dictionary.
+
+        Returns:
+            QSSRule: An independent copy of the rule.
+        """
+        clone = copy.copy(self)
+        clone._properties = list(self._properties)
+        clone.pseudo_states = self.pseudo_states.copy()
+        clone._on_change = None
+        clone._name_index = {}
+        clone._name_index_version = -1
+        return clone
+
     def __repr__(self) -> str:
         """
         Returns a string representation of the rule in QSS format.
@@ -347,6 +649,8 @@ class QSSRule:
         Returns:
             bool: True if the rules are equal, False otherwise.
         """
+        if self is other:
+            return True
         if not isinstance(other, QSSRule):
             return False
         return self.selector == other.selector and self.properties == other.properties
@@ -361,6 +665,11 @@ class VariableManager:
 
     Attributes:
         _variables (dict): Dictionary storing variable names and their values.
+        _resolved (Dict[str, Tuple[str, Optional[str]]]): Results of resolve_variable
+            by value, cleared whenever a variable is defined.
+        _expanded (Dict[str, Tuple[str, Optional[str]]]): Fully expanded value of
+            each variable referenced so far, with its first circular reference
+            error, cleared whenever a variable is defined.
         _logger (logging.Logger): Logger instance for debugging and error reporting.
     """
 
@@ -369,6 +678,8 @@ class VariableManager:
         Initialize a new VariableManager instance.
         """
         self._variables: Dict[str, str] = {}
+        self._resolved: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._expanded: Dict[str, Tuple[str, Optional[str]]] = {}
         self._logger = logging.getLogger(__name__)
 
     def parse_variables(
@@ -408,6 +719,8 @@ class VariableManager:
             name = name.strip()
             value = value.strip()
             self._variables[name] = value
+            self._resolved.clear()
+            self._expanded.clear()
             if on_variable_defined:
                 on_variable_defined(name, value)
         return errors
@@ -417,6 +730,8 @@ class VariableManager:
         Resolve variable references in a value string.
 
         This method handles nested variable references and detects circular references.
+        Results are memoized per value until a variable is defined, since the
+        same var() values tend to repeat across rules.
 
         Args:
             value (str): The value string that may contain variable references.
@@ -426,7 +741,67 @@ class VariableManager:
                 - The resolved value string
                 - An error message if any errors occurred, None otherwise
         """
-        visited: Set[str] = set()
+        if "var(" not in value:
+            return value, None
+        resolved = self._resolved.get(value)
+        if resolved is None:
+            resolved = self._resolve_uncached(value)
+            self._resolved[value] = resolved
+        return resolved
+
+    def _resolve_uncached(self, value: str) -> Tuple[str, Optional[str]]:
+        """
+        Resolve variable references in a value string without memoization.
+
+        Each reference is replaced in a single pass by the expanded value of
+        its variable.
+
+        Args:
+            value (str): The value string containing variable references.
+
+        Returns:
+            Tuple[str, Optional[str]]: The resolved value and an error message,
+                or None if no errors occurred.
+        """
+        errors: List[str] = []
+        undefined_vars: List[str] = []
+
+        def replace_var(match: Match[str]) -> str:
+            var_name = match.group(1)
+            if var_name not in self._variables:
+                undefined_vars.append(var_name)
+                return match.group(0)
+            expanded, error = self._expand_variable(var_name)
+            if error:
+                errors.append(error)
+            return expanded
+
+        resolved_value = Constants.COMPILED_VARIABLE_PATTERN.sub(replace_var, value)
+        error = None
+        if errors:
+            error = errors[0]
+        elif undefined_vars:
+            error = f"Undefined variables: {', '.join(undefined_vars)}"
+        return resolved_value, error
+
+    def _expand_variable(self, name: str) -> Tuple[str, Optional[str]]:
+        """
+        Expand a defined variable, replacing nested references transitively.
+
+        Expansions are memoized per variable, so nested variables shared by
+        many values are expanded once until a variable is defined.
+
+        Args:
+            name (str): The name of a defined variable.
+
+        Returns:
+            Tuple[str, Optional[str]]: The expanded value and the first circular
+                reference error found, or None if there was none.
+        """
+        expanded = self._expanded.get(name)
+        if expanded is not None:
+            return expanded
+        visited: Set[str] = {name}
         errors: List[str] = []
 
         def replace_var(match: Match[str]) -> str:
@@ -439,25 +814,18 @@ class VariableManager:
             if var_name not in self._variables:
                 return match.group(0)
             visited.add(var_name)
-            resolved_value = self._variables[var_name]
-            nested_value = re.sub(
-                Constants.VARIABLE_PATTERN, replace_var, resolved_value
+            nested_value = Constants.COMPILED_VARIABLE_PATTERN.sub(
+                replace_var, self._variables[var_name]
             )
             visited.remove(var_name)
             return nested_value
 
-        resolved_value = re.sub(Constants.VARIABLE_PATTERN, replace_var, value)
-        undefined_vars = [
-            match.group(1)
-            for match in re.finditer(Constants.VARIABLE_PATTERN, value)
-            if match.group(1) not in self._variables and match.group(1) not in visited
-        ]
-        error = None
-        if errors:
-            error = errors[0]
-        elif undefined_vars:
-            error = f"Undefined variables: {', '.join(undefined_vars)}"
-        return resolved_value, error
+        expanded = (
+            Constants.COMPILED_VARIABLE_PATTERN.sub(replace_var, self._variables[name]),
+            errors[0] if errors else None,
+        )
+        self._expanded[name] = expanded
+        return expanded
 
 
 class SelectorUtils:
@@ -480,7 +848,9 @@ class SelectorUtils:
         Returns:
             bool: True if the line contains a complete rule, False otherwise.
         """
-        return bool(re.match(Constants.COMPLETE_RULE_PATTERN, line))
+        if "{" not in line or "}" not in line:
+            return False
+        return bool(Constants.COMPILED_COMPLETE_RULE_PATTERN.match(line))
 
     @staticmethod
     def extract_attributes(selector: str) -> List[str]:
@@ -493,8 +863,23 @@ class SelectorUtils:
         Returns:
             List[str]: List of attribute selectors found in the selector.
         """
+        if "[" not in selector:
+            return []
         return Constants.COMPILED_ATTRIBUTE_PATTERN.findall(selector)
 
+    @staticmethod
+    def split_selectors(selector: str) -> List[str]:
+        """
+        Split a comma-separated selector list into its individual selectors.
+
+        Args:
+            selector (str): The selector list to split.
+
+        Returns:
+            List[str]: The stripped, non-empty selectors in their original order.
+        """
+        return [sel for sel in (part.strip() for part in selector.split(",")) if sel]
+
     @staticmethod
     def normalize_selector(selector: str) -> str:
         """
@@ -509,25 +894,57 @@ class SelectorUtils:
         Returns:
             str: The normalized selector string.
         """
-        selectors = [s.strip() for s in selector.split(",") if s.strip()]
-        normalized_selectors = []
-        for sel in selectors:
-            attributes = SelectorUtils.extract_attributes(sel)
-            temp_placeholders = [f"__ATTR_{i}__" for i in range(len(attributes))]
-            temp_sel = sel
-            for placeholder, attr in zip(temp_placeholders, attributes):
-                temp_sel = temp_sel.replace(attr, placeholder)
+        return ", ".join(
+            SelectorUtils._normalize_single_selector(sel)
+            for sel in SelectorUtils.split_selectors(selector)
+        )
+
+    @staticmethod
+    def _normalize_single_selector(selector: str) -> str:
+        """
+        Normalize one selector of a selector list in a single token scan.
 
-            temp_sel = re.sub(r"(\w+)(#[-\w]+)", r"\1 \2", temp_sel)
-            temp_sel = re.sub(r"\s*>\s*", " > ", temp_sel)
-            temp_sel = re.sub(r"\s+", " ", temp_sel)
-            temp_sel = temp_sel.strip()
+        Attribute selectors are copied unchanged, child combinators become
+        " > " and other whitespace runs a single space. An ID directly after a
+        class name is separated by a space, as in "QPushButton #ok". A word
+        that already ends such a class-id pair, including attributes and
+        words joined to it, does not start another pair, so "a#b#c" becomes
+        "a #b#c".
 
-            for placeholder, attr in zip(temp_placeholders, attributes):
-                temp_sel = temp_sel.replace(placeholder, attr)
+        Args:
+            selector (str): A single selector without commas.
 
-            normalized_selectors.append(temp_sel)
-        return ", ".join(normalized_selectors)
+        Returns:
+            str: The normalized selector.
+        """
+        parts: List[str] = []
+        # Whether the last token ends a run of word characters or attributes,
+        # and whether that run already belongs to a class-id pair.
+        in_word = False
+        paired = False
+        for match in Constants.COMPILED_SELECTOR_TOKEN_PATTERN.finditer(selector):
+            kind = match.lastgroup
+            token = match.group()
+            if kind == "attribute" or kind == "word":
+                paired = in_word and paired
+                in_word = True
+            elif kind == "id":
+                if in_word and not paired:
+                    parts.append(" ")
+                    paired = True
+                else:
+                    in_word = token[-1] != "-"
+                    paired = False
+            else:
+                in_word = paired = False
+                if kind == "child":
+                    token = "> " if parts and parts[-1].endswith(" ") else " > "
+                elif kind == "space":
+                    if parts and parts[-1].endswith(" "):
+                        continue
+                    token = " "
+            parts.append(token)
+        return "".join(parts).strip()
 
     @staticmethod
     def parse_selector(
@@ -551,16 +968,19 @@ class SelectorUtils:
         attributes = SelectorUtils.extract_attributes(selector)
         pseudo_states: List[str] = []
 
-        selector_clean = Constants.COMPILED_ATTRIBUTE_PATTERN.sub("", selector)
-        selector_clean = re.sub(r"::\w+", "", selector_clean)
+        selector_clean = (
+            Constants.COMPILED_ATTRIBUTE_PATTERN.sub("", selector)
+            if attributes
+            else selector
+        )
+        selector_clean = Constants.COMPILED_PSEUDO_ELEMENT_PATTERN.sub(
+            "", selector_clean
+        )
         parts = selector_clean.split(":")
         main_selector = parts[0].strip()
         pseudo_states = [p.strip() for p in parts[1:] if p.strip()]
 
-        selector_parts = [
-            part.strip() for part in re.split(r"\s+", main_selector) if part.strip()
-        ]
-        for part in selector_parts:
+        for part in main_selector.split():
             if part.startswith("#"):
                 object_name = part[1:]
             elif part and not class_name:
@@ -587,79 +1007,111 @@ class SelectorUtils:
         Returns:
             List[str]: List of error messages for any syntax errors found.
         """
+        return [
+            f"Error on line {line_num}: {error}"
+            for error in SelectorUtils._validate_selector_syntax(selector)
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _validate_selector_syntax(selector: str) -> Tuple[str, ...]:
+        """
+        Cached implementation of validate_selector_syntax.
+
+        Results depend only on the selector, so the same selector is validated
+        once wherever it appears. Messages are stored without their line number
+        as tuples, so cached entries cannot be mutated by callers.
+
+        Args:
+            selector (str): The selector to validate.
+
+        Returns:
+            Tuple[str, ...]: Error messages for any syntax errors found.
+        """
         errors: List[str] = []
         selector = selector.strip()
 
-        selectors = [s.strip() for s in selector.split(",") if s.strip()]
+        selectors = SelectorUtils.split_selectors(selector)
         if len(selectors) > 1:
             seen_selectors: Set[str] = set()
             for sel in selectors:
                 if sel in seen_selectors:
-                    errors.append(
-                        f"Error on line {line_num}: Duplicate selector '{sel}' in comma-separated list"
-                    )
+                    errors.append(f"Duplicate selector '{sel}' in comma-separated list")
                 seen_selectors.add(sel)
 
         for sel in selectors:
             attributes = SelectorUtils.extract_attributes(sel)
             for attr in attributes:
-                if not re.match(
-                    r'\[\w+(?:(?:~|=|\|=|\^=|\$=|\*=)(?:"[^"]*"|[^\s"\]]*))?[^[]*\]',
-                    attr,
-                ):
+                if not Constants.COMPILED_ATTRIBUTE_PATTERN.match(attr):
                     errors.append(
-                        f"Error on line {line_num}: Invalid selector: '{sel}'. "
+                        f"Invalid selector: '{sel}'. "
                         f"Malformed attribute selector '{attr}'"
                     )
-                if re.match(r"\[\w+(?:~|=|\|=|\^=|\$=|\*=)\]", attr):
+                if Constants.COMPILED_EMPTY_ATTRIBUTE_VALUE_PATTERN.match(attr):
                     errors.append(
-                        f"Error on line {line_num}: Invalid selector: '{sel}'. "
+                        f"Invalid selector: '{sel}'. "
                         f"Malformed attribute selector '{attr}'"
                     )
 
-            parts = re.split(r"([>]\s*)", sel)
-            for part in parts:
-                if part.strip() in ["", ">"]:
-                    continue
+            for part in sel.split(">"):
                 sub_parts = part.split()
                 for i, sub_part in enumerate(sub_parts):
                     if sub_part.startswith("[") and i > 0:
                         errors.append(
-                            f"Error on line {line_num}: Invalid selector: '{sel}'. "
+                            f"Invalid selector: '{sel}'. "
                             f"Space not allowed before attribute selector '{sub_part}'"
                         )
 
-            matches = re.finditer(Constants.PSEUDO_PATTERN, sel)
+            matches = Constants.COMPILED_PSEUDO_PATTERN.finditer(sel)
             for match in matches:
                 prefix, colon, pseudo = match.groups()
                 full_match = match.group(0)
-                if re.search(r"\s+:{1,2}\s*", full_match):
+                if Constants.COMPILED_PSEUDO_SPACING_PATTERN.search(full_match):
                     pseudo_type = "pseudo-element" if colon == "::" else "pseudo-state"
                     errors.append(
-                        f"Error on line {line_num}: Invalid spacing in selector: '{sel}'. "
+                        f"Invalid spacing in selector: '{sel}'. "
                         f"No space allowed between '{prefix}' and '{colon}{pseudo}' ({pseudo_type})"
                     )
                 pseudo_full = f"{colon}{pseudo}"
-                if colon == "::" and pseudo_full not in Constants.PSEUDO_ELEMENTS:
+                if colon == "::" and pseudo_full not in Constants.PSEUDO_ELEMENTS_SET:
                     errors.append(
-                        f"Error on line {line_num}: Invalid pseudo-element '{pseudo_full}' in selector: '{sel}'. "
+                        f"Invalid pseudo-element '{pseudo_full}' in selector: '{sel}'. "
                         f"Must be one of {', '.join(Constants.PSEUDO_ELEMENTS)}"
                     )
-                elif colon == ":" and pseudo_full not in Constants.PSEUDO_STATES:
+                elif colon == ":" and pseudo_full not in Constants.PSEUDO_STATES_SET:
                     errors.append(
-                        f"Error on line {line_num}: Invalid pseudo-state '{pseudo_full}' in selector: '{sel}'. "
+                        f"Invalid pseudo-state '{pseudo_full}' in selector: '{sel}'. "
                         f"Must be one of {', '.join(Constants.PSEUDO_STATES)}"
                     )
 
-            for match in re.finditer(Constants.COMBINATOR_PATTERN, sel):
+            for match in Constants.COMPILED_COMBINATOR_PATTERN.finditer(sel):
                 left, combinator, right = match.groups()
                 if combinator not in [" ", ">"]:
                     errors.append(
-                        f"Error on line {line_num}: Invalid combinator in selector: '{sel}'. "
+                        f"Invalid combinator in selector: '{sel}'. "
                         f"Invalid combinator '{combinator}' between '{left}' and '{right}'"
                     )
 
-        return errors
+        return tuple(errors)
+
+    @staticmethod
+    def strip_block_comments(text: str) -> str:
+        """
+        Remove all complete block comments from a QSS text in a single pass.
+
+        Line breaks inside removed comments are kept so that line numbers in
+        error messages still refer to the original text. Unterminated comments
+        are left in place.
+
+        Args:
+            text (str): The QSS text to process.
+
+        Returns:
+            str: The text with block comments removed.
+        """
+        return Constants.COMPILED_COMMENT_PATTERN.sub(
+            lambda match: "\n" * match.group().count("\n"), text
+        )
 
     @staticmethod
     def strip_comments(line: str) -> str:
@@ -672,11 +1124,20 @@ class SelectorUtils:
         Returns:
             str: The line with comments removed.
         """
-        while "/*" in line and "*/" in line:
-            start = line.index("/*")
-            end = line.index("*/", start) + 2
-            line = line[:start] + line[end:]
-        return line.strip()
+        start = line.find("/*")
+        if start == -1:
+            return line.strip()
+        parts: List[str] = []
+        pos = 0
+        while start != -1:
+            end = line.find("*/", start)
+            if end == -1:
+                break
+            parts.append(line[pos:start])
+            pos = end + 2
+            start = line.find("/*", pos)
+        parts.append(line[pos:])
+        return "".join(parts).strip()
 
 
 class QSSFormatter:
@@ -751,7 +1212,7 @@ class DefaultPropertyProcessor:
         line = line.strip()
         if not rules or not line:
             self._logger.debug(
-                f"Skipping empty property line or no rules on line {line_num}"
+                "Skipping empty property line or no rules on line %s", line_num
             )
             return
         parts = line.split(":", 1)
@@ -776,10 +1237,11 @@ class DefaultPropertyProcessor:
         if error:
             self._error_handler.dispatch_error(f"Error on line {line_num}: {error}")
             return
-        normalized_line = f"{name}: {resolved_value};"
         for rule in rules:
             rule.add_property(name, resolved_value)
-        self._logger.debug(f"Processed property on line {line_num}: {normalized_line}")
+        self._logger.debug(
+            "Processed property on line %s: %s: %s;", line_num, name, resolved_value
+        )
 
     def _is_valid_property_name(self, name: str) -> bool:
         """
@@ -792,9 +1254,9 @@ class DefaultPropertyProcessor:
             bool: True if the property name is valid, False otherwise.
         """
         if name.startswith("qproperty-"):
-            return bool(re.match(r"^qproperty-[a-zA-Z_][a-zA-Z0-9_-]*$", name))
+            return bool(Constants.COMPILED_QPROPERTY_NAME_PATTERN.match(name))
         else:
-            return bool(re.match(r"^[a-zA-Z][a-zA-Z0-9-]*$", name))
+            return bool(Constants.COMPILED_PROPERTY_NAME_PATTERN.match(name))
 
 
 @dataclass
@@ -807,32 +1269,78 @@ class ParserState:
 
     Attributes:
         rules (List[QSSRule]): List of all parsed QSS rules.
-        buffer (str): Buffer for accumulating partial property declarations.
+        buffer_lines (List[str]): Lines of a partial property declaration being
+            accumulated, joined with spaces once the declaration ends.
+        buffer (str): buffer_lines joined with spaces, kept for plugins written
+            against the former string field.
         in_comment (bool): Flag indicating if currently parsing a comment.
         in_rule (bool): Flag indicating if currently parsing a rule.
         in_variables (bool): Flag indicating if currently parsing variables.
         current_selectors (List[str]): List of selectors being processed.
         original_selector (Optional[str]): Original selector text before processing.
         current_rules (List[QSSRule]): List of rules currently being processed.
-        variable_buffer (str): Buffer for accumulating variable declarations.
+        variable_lines (List[str]): Lines of the variable block being accumulated.
+        variable_buffer (str): variable_lines joined with spaces, kept for plugins
+            written against the former string field.
         current_line (int): Current line number being processed.
         property_lines (List[str]): List of property lines in current rule.
         rule_start_line (int): Line number where current rule started.
     """
 
     rules: List[QSSRule] = field(default_factory=list)
-    buffer: str = ""
+    buffer_lines: List[str] = field(default_factory=list)
     in_comment: bool = False
     in_rule: bool = False
     in_variables: bool = False
     current_selectors: List[str] = field(default_factory=list)
     original_selector: Optional[str] = None
     current_rules: List[QSSRule] = field(default_factory=list)
-    variable_buffer: str = ""
+    variable_lines: List[str] = field(default_factory=list)
     current_line: int = 1
     property_lines: List[str] = field(default_factory=list)
     rule_start_line: int = 0
 
+    @property
+    def buffer(self) -> str:
+        """
+        The partial property declaration accumulated so far.
+
+        Returns:
+            str: buffer_lines joined with spaces.
+        """
+        return " ".join(self.buffer_lines)
+
+    @buffer.setter
+    def buffer(self, buffer: str) -> None:
+        """
+        Replace the partial property declaration.
+
+        Args:
+            buffer (str): The declaration text, or an empty string to clear it.
+        """
+        self.buffer_lines = [buffer] if buffer else []
+
+    @property
+    def variable_buffer(self) -> str:
+        """
+        The variable declarations accumulated so far.
+
+        Returns:
+            str: variable_lines joined with spaces.
+        """
+        return " ".join(self.variable_lines)
+
+    @variable_buffer.setter
+    def variable_buffer(self, variable_buffer: str) -> None:
+        """
+        Replace the accumulated variable declarations.
+
+        Args:
+            variable_buffer (str): The declarations text, or an empty string to
+                clear them.
+        """
+        self.variable_lines = [variable_buffer] if variable_buffer else []
+
     def reset(self) -> None:
         """
         Reset the parser state to its initial values.
@@ -841,14 +1349,14 @@ class ParserState:
         to their default values.
         """
         self.rules = []
-        self.buffer = ""
+        self.buffer_lines = []
         self.in_comment = False
         self.in_rule = False
         self.in_variables = False
         self.current_selectors = []
         self.original_selector = None
         self.current_rules = []
-        self.variable_buffer = ""
+        self.variable_lines = []
         self.current_line = 1
         self.property_lines = []
         self.rule_start_line = 0
@@ -913,7 +1421,7 @@ class BaseQSSPlugin(QSSParserPlugin):
         Process a line containing QSS property declarations.
 
         This method handles both complete and partial property declarations,
-        accumulating them in the state buffer as needed.
+        accumulating partial lines in the state buffer as needed.
 
         Args:
             line (str): The line to process.
@@ -934,8 +1442,12 @@ class BaseQSSPlugin(QSSParserPlugin):
             return False
 
         if ";" in line:
-            full_line = (state.buffer + " " + line).strip() if state.buffer else line
-            state.buffer = ""
+            if state.buffer_lines:
+                state.buffer_lines.append(line)
+                full_line = " ".join(state.buffer_lines)
+                state.buffer_lines = []
+            else:
+                full_line = line
             parts = full_line.split(";")
             for part in parts[:-1]:
                 if part.strip():
@@ -946,10 +1458,10 @@ class BaseQSSPlugin(QSSParserPlugin):
                         state.current_line,
                     )
             if parts[-1].strip():
-                state.buffer = parts[-1].strip()
+                state.buffer_lines.append(parts[-1].strip())
             return True
 
-        state.buffer = (state.buffer + " " + line).strip()
+        state.buffer_lines.append(line)
         return True
 
 
@@ -1004,27 +1516,29 @@ class SelectorPlugin(BaseQSSPlugin):
         if not line or state.in_comment or state.in_variables:
             return False
 
-        if SelectorUtils.is_complete_rule(line):
-            self._process_complete_rule(line, state, variable_manager)
-            return True
+        if "{" in line and "}" in line:
+            match = Constants.COMPILED_COMPLETE_RULE_PARTS_PATTERN.match(line)
+            if match:
+                self._process_complete_rule(match, state, variable_manager)
+                return True
 
-        if line.endswith(","):
+        last_char = line[-1]
+        if last_char == ",":
             selector_part = line[:-1].strip()
             if selector_part:
                 normalized_selector = SelectorUtils.normalize_selector(selector_part)
-                selectors = [
-                    s.strip() for s in normalized_selector.split(",") if s.strip()
-                ]
-                state.current_selectors.extend(selectors)
+                state.current_selectors.extend(
+                    SelectorUtils.split_selectors(normalized_selector)
+                )
             return True
 
-        if line.endswith("{") and not state.in_rule:
+        if last_char == "{" and not state.in_rule:
             return self._start_rule(line, state, variable_manager)
 
-        if line.strip() == "}" and state.in_rule:
+        if line == "}" and state.in_rule:
             return self._end_rule(state, variable_manager)
 
-        if line.endswith("{") and state.in_rule:
+        if last_char == "{" and state.in_rule:
             self._error_handler.dispatch_error(
                 f"Error on line {state.rule_start_line}: Unclosed brace '{{' for selector: {state.original_selector}"
             )
@@ -1049,13 +1563,14 @@ class SelectorPlugin(BaseQSSPlugin):
         Returns:
             bool: True if the rule was successfully started.
         """
-        state.buffer = ""
+        state.buffer_lines = []
         state.property_lines = []
         selector_part = SelectorUtils.strip_comments(line.split("{")[0].strip())
         if selector_part:
             normalized_selector = SelectorUtils.normalize_selector(selector_part)
-            selectors = [s.strip() for s in normalized_selector.split(",") if s.strip()]
-            state.current_selectors.extend(selectors)
+            state.current_selectors.extend(
+                SelectorUtils.split_selectors(normalized_selector)
+            )
         if not state.current_selectors and not selector_part:
             self._error_handler.dispatch_error(
                 f"Error on line {state.current_line}: Empty selector before '{{': {{"
@@ -1157,12 +1672,15 @@ class SelectorPlugin(BaseQSSPlugin):
         state.current_selectors = []
         state.original_selector = None
         state.property_lines = []
-        state.buffer = ""
+        state.buffer_lines = []
         state.rule_start_line = 0
         return True
 
     def _process_complete_rule(
-        self, line: str, state: ParserState, variable_manager: VariableManager
+        self,
+        match: Match[str],
+        state: ParserState,
+        variable_manager: VariableManager,
     ) -> None:
         """
         Process a complete QSS rule from a single line.
@@ -1171,19 +1689,15 @@ class SelectorPlugin(BaseQSSPlugin):
         including selector validation and property processing.
 
         Args:
-            line (str): The line containing the complete rule.
+            match (Match[str]): The match of
+                Constants.COMPILED_COMPLETE_RULE_PARTS_PATTERN against the line,
+                capturing the selector and the properties.
             state (ParserState): Current state of the parser.
             variable_manager (VariableManager): Manager for handling variables.
         """
-        match = re.match(r"^\s*([^/][^{}]*)\s*\{([^}]*)\}\s*$", line)
-        if not match:
-            self._error_handler.dispatch_error(
-                f"Error on line {state.current_line}: Malformed rule: {line}"
-            )
-            return
         selector, properties = match.groups()
         normalized_selector = SelectorUtils.normalize_selector(selector.strip())
-        selectors = [s.strip() for s in normalized_selector.split(",") if s.strip()]
+        selectors = SelectorUtils.split_selectors(normalized_selector)
         if not selectors:
             return
         errors = SelectorUtils.validate_selector_syntax(
@@ -1341,29 +1855,29 @@ class VariablePlugin(QSSParserPlugin):
             return True
         if line == "@variables {" and not state.in_rule:
             state.in_variables = True
-            state.variable_buffer = ""
+            state.variable_lines = []
             return True
         if state.in_variables:
             if line == "}":
 
                 def dispatch_variable_defined(name: str, value: str) -> None:
                     if isinstance(self._error_handler, QSSParser):
-                        for handler in self._error_handler._event_handlers.get(
-                            ParserEvent.VARIABLE_DEFINED.value, []
-                        ):
-                            handler(name, value)
+                        self._error_handler._emit(
+                            ParserEvent.VARIABLE_DEFINED, name, value
+                        )
 
                 errors = variable_manager.parse_variables(
-                    state.variable_buffer,
+                    " ".join(state.variable_lines),
                     state.current_line,
                     on_variable_defined=dispatch_variable_defined,
                 )
                 for error in errors:
                     self._error_handler.dispatch_error(error)
                 state.in_variables = False
-                state.variable_buffer = ""
+                state.variable_lines = []
                 return True
-            state.variable_buffer = (state.variable_buffer + " " + line).strip()
+            if line:
+                state.variable_lines.append(line)
             return True
         return False
 
@@ -1381,6 +1895,12 @@ class ParserEvent(Enum):
     PARSE_COMPLETED = "parse_completed"  # Emitted when parsing is complete
 
 
+_ParseCacheEntry = Tuple[
+    ParserState, Dict[str, str], List[Tuple[ParserEvent, Tuple[Any, ...]]], bool
+]
+_StylesCacheKey = Tuple[str, str, Optional[str], Tuple[str, ...], bool]
+
+
 class QSSParser:
     """
     Main class for parsing Qt Style Sheets (QSS).
@@ -1393,19 +1913,48 @@ class QSSParser:
         _state (ParserState): Current state of the parser.
         _style_selector (QSSStyleSelector): Selector for applying styles to widgets.
         _variable_manager (VariableManager): Manager for handling variables.
-        _event_handlers (Dict[str, List[Callable[..., None]]]): Event handlers.
+        _event_handlers (Dict[str, Tuple[Callable[..., None], ...]]): Event
+            handlers, stored as tuples that are replaced when a handler is
+            registered.
         _rule_map (Dict[str, QSSRule]): Map of selectors to rules.
         _logger (logging.Logger): Logger instance for debugging and error reporting.
         _error_handler (ErrorHandlerProtocol): Handler for reporting errors.
         _property_processor (PropertyProcessorProtocol): Processor for properties.
         _plugins (List[QSSParserPlugin]): List of parser plugins.
+        _use_parse_cache (bool): Whether parse results can be shared through the
+            class-level parse cache. Only QSSParser instances, not subclasses,
+            using the default property processor and plugins are cacheable,
+            unless caching was turned off.
+        _recorded_events (Optional[List[Tuple[ParserEvent, Tuple[Any, ...]]]]):
+            Events emitted during the current parse, recorded for the parse cache.
+        _parse_cache (OrderedDict[str, _ParseCacheEntry]): LRU cache shared by all
+            parsers, mapping QSS text to a snapshot of its parse result.
+        _PARSE_CACHE_SIZE (int): Maximum number of entries kept in _parse_cache.
+        _styles_cache (OrderedDict[_StylesCacheKey, str]): LRU cache of
+            get_styles_for results for the current rules, keyed by the widget's
+            object and class names and the remaining arguments.
+        _STYLES_CACHE_SIZE (int): Maximum number of entries kept in _styles_cache.
+        _rules_version (int): Counter advanced whenever one of the parser's own
+            rules changes.
+        _styles_version (int): Value of _rules_version the entries of
+            _styles_cache were computed at.
+        _to_string_cache (Optional[str]): Output of to_string for the current rules.
+        _to_string_version (int): Value of _rules_version _to_string_cache was
+            built at.
+        _last_parsed_text (Optional[str]): Text last parsed by this parser, used
+            to find a cached prefix when the next text extends it.
     """
 
+    _PARSE_CACHE_SIZE: ClassVar[int] = 128
+    _STYLES_CACHE_SIZE: ClassVar[int] = 256
+    _parse_cache: ClassVar["OrderedDict[str, _ParseCacheEntry]"] = OrderedDict()
+
     def __init__(
         self,
         property_processor: Optional[PropertyProcessorProtocol] = None,
         plugins: Optional[List[QSSParserPlugin]] = None,
         logger: Optional[logging.Logger] = None,
+        use_parse_cache: bool = True,
     ) -> None:
         """
         Initialize a new QSSParser instance.
@@ -1416,14 +1965,21 @@ class QSSParser:
             plugins (Optional[List[QSSParserPlugin]]): List of parser plugins.
                 If None, uses default plugins.
             logger (Optional[logging.Logger]): Custom logger instance.
+            use_parse_cache (bool): Whether to read and store parse results in
+                the parse cache shared by all parsers. Defaults to True.
         """
         self._state: ParserState = ParserState()
         self._style_selector: QSSStyleSelector = QSSStyleSelector(logger=logger)
         self._variable_manager: VariableManager = VariableManager()
-        self._event_handlers: Dict[str, List[Callable[..., None]]] = {
-            event.value: [] for event in ParserEvent
+        self._event_handlers: Dict[str, Tuple[Callable[..., None], ...]] = {
+            event.value: () for event in ParserEvent
         }
         self._rule_map: Dict[str, QSSRule] = {}
+        self._styles_cache: "OrderedDict[_StylesCacheKey, str]" = OrderedDict()
+        self._rules_version: int = 0
+        self._styles_version: int = 0
+        self._to_string_cache: Optional[str] = None
+        self._to_string_version: int = 0
         self._logger: logging.Logger = logger or logging.getLogger(__name__)
 
         self._error_handler: ErrorHandlerProtocol = self
@@ -1436,6 +1992,51 @@ class QSSParser:
             SelectorPlugin(self._property_processor, self, self._error_handler),
             PropertyPlugin(self._property_processor, self._error_handler),
         ]
+        self._use_parse_cache: bool = (
+            use_parse_cache
+            and type(self) is QSSParser
+            and property_processor is None
+            and not plugins
+        )
+        self._recorded_events: Optional[List[Tuple[ParserEvent, Tuple[Any, ...]]]] = (
+            None
+        )
+        self._last_parsed_text: Optional[str] = None
+
+    @classmethod
+    def clear_parse_cache(cls) -> None:
+        """
+        Clear the parse results cached for all parser instances.
+        """
+        cls._parse_cache.clear()
+
+    def _emit(self, event: ParserEvent, *args: Any) -> None:
+        """
+        Call the handlers registered for an event.
+
+        While a cacheable parse is running, the event is also recorded so it
+        can be replayed when the same QSS text is parsed again. Handlers are
+        called from the tuple registered when the event was emitted, so a
+        handler registered by another handler only sees later events.
+
+        Args:
+            event (ParserEvent): The event to emit.
+            *args (Any): Arguments passed to each handler.
+        """
+        if self._recorded_events is not None:
+            self._recorded_events.append((event, args))
+        self._dispatch(event, *args)
+
+    def _dispatch(self, event: ParserEvent, *args: Any) -> None:
+        """
+        Call the handlers registered for an event without recording it.
+
+        Args:
+            event (ParserEvent): The event to dispatch.
+            *args (Any): Arguments passed to each handler.
+        """
+        for handler in self._event_handlers[event.value]:
+            handler(*args)
 
     def dispatch_error(self, error: str) -> None:
         """
@@ -1444,9 +2045,8 @@ class QSSParser:
         Args:
             error (str): The error message to dispatch.
         """
-        self._logger.warning(f"Error: {error}")
-        for handler in self._event_handlers[ParserEvent.ERROR_FOUND.value]:
-            handler(error)
+        self._logger.warning("Error: %s", error)
+        self._emit(ParserEvent.ERROR_FOUND, error)
 
     def handle_rule(self, rule: QSSRule) -> None:
         """
@@ -1455,40 +2055,46 @@ class QSSParser:
         This method merges or adds the rule to the parser's rule collection
         and notifies rule handlers.
 
+        While a cacheable parse is running, a copy of the incoming rule is
+        recorded before it is merged or seen by any handler, so replaying the
+        event handles the rule again instead of reusing rules changed afterwards.
+
         Args:
             rule (QSSRule): The rule to handle.
         """
-        self._logger.debug(f"Handling rule: {rule.selector}")
+        if self._recorded_events is not None:
+            self._recorded_events.append(
+                (ParserEvent.RULE_ADDED, (copy.deepcopy(rule),))
+            )
+        self._logger.debug("Handling rule: %s", rule.selector)
         self._merge_or_add_rule(rule)
-        if (
-            ":" in rule.selector
-            and "::" not in rule.selector
-            and "," not in rule.selector
-            and not re.search(r"\[[^\]]*:[^\]]*\]", rule.selector)
-        ):
-            base_rule = rule.clone_without_pseudo_elements()
-            self._merge_or_add_rule(base_rule)
 
     def _merge_or_add_rule(self, rule: QSSRule) -> None:
         """
         Merge a rule with an existing rule or add it as new.
 
+        Rules are looked up by selector in a single dictionary operation, and
+        a repeated selector keeps its first position with the last value of
+        each property.
+
         Args:
             rule (QSSRule): The rule to merge or add.
         """
-        existing_rule = self._rule_map.get(rule.selector)
-        if existing_rule:
-            prop_map = {p.name: p for p in existing_rule.properties}
-            for prop in rule.properties:
-                prop_map[prop.name] = prop
-            existing_rule.properties = list(prop_map.values())
-            for handler in self._event_handlers[ParserEvent.RULE_ADDED.value]:
-                handler(existing_rule)
+        self._styles_cache.clear()
+        self._to_string_cache = None
+        existing_rule = self._rule_map.setdefault(rule.selector, rule)
+        if existing_rule is not rule:
+            existing_rule.merge_properties(rule.properties)
         else:
-            self._rule_map[rule.selector] = rule
+            rule._on_change = self._record_rules_change
             self._state.rules.append(rule)
-            for handler in self._event_handlers[ParserEvent.RULE_ADDED.value]:
-                handler(rule)
+        self._dispatch(ParserEvent.RULE_ADDED, existing_rule)
+
+    def _record_rules_change(self) -> None:
+        """
+        Advance the version of the parser's rules after one of them changes.
+        """
+        self._rules_version += 1
 
     def on(self, event: ParserEvent, handler: Callable[..., None]) -> None:
         """
@@ -1500,26 +2106,175 @@ class QSSParser:
         """
         event_value = event.value if isinstance(event, ParserEvent) else event
         if event_value in self._event_handlers:
-            self._event_handlers[event_value].append(handler)
-            self._logger.debug(f"Registered handler for event: {event_value}")
+            self._event_handlers[event_value] += (handler,)
+            self._logger.debug("Registered handler for event: %s", event_value)
 
     def parse(self, qss_text: str) -> None:
         """
         Parse a QSS text string.
 
         This method processes the QSS text line by line using the registered
-        plugins.
+        plugins. Lines are scanned lazily from the text rather than split into
+        a list up front.
+
+        Results are kept in a bounded LRU cache keyed by the QSS text. Parsing
+        text that is already cached restores the cached variables and rebuilds
+        the rules by replaying the recorded events, so handlers observe and
+        may change the rules as in a full parse without affecting the cache.
+
+        Parsing text that extends the text this parser parsed last, such as a
+        stylesheet built up from fragments, restores the cached result of the
+        previous text in the same way and parses only the appended part, when
+        the previous text ended outside of any block.
 
         Args:
             qss_text (str): The QSS text to parse.
         """
+        last_text, self._last_parsed_text = self._last_parsed_text, None
         self._reset()
-        lines = qss_text.splitlines()
-        for line in lines:
-            self._process_line(line)
+        if not self._use_parse_cache:
+            self._parse_text(qss_text)
+        else:
+            cached = self._parse_cache.get(qss_text)
+            prefix = (
+                self._parse_cache.get(last_text)
+                if cached is None
+                and last_text is not None
+                and qss_text.startswith(last_text)
+                else None
+            )
+            if cached is not None:
+                self._parse_cache.move_to_end(qss_text)
+                self._restore_parse_result(cached)
+            elif prefix is not None and prefix[3] and last_text is not None:
+                events = self._restore_parse_result(prefix)
+                self._parse_and_record(qss_text, qss_text[len(last_text) :], events)
+            else:
+                self._parse_and_record(qss_text, qss_text, [])
+            self._last_parsed_text = qss_text
+        self._emit(ParserEvent.PARSE_COMPLETED)
+        self._logger.debug("Parsing completed and parse_completed event dispatched")
+
+    def _parse_and_record(
+        self,
+        qss_text: str,
+        new_text: str,
+        events: List[Tuple[ParserEvent, Tuple[Any, ...]]],
+    ) -> None:
+        """
+        Parse text while recording its events for the parse cache.
+
+        Args:
+            qss_text (str): The complete QSS text, used as the cache key.
+            new_text (str): The part of qss_text that has not been parsed yet.
+            events (List[Tuple[ParserEvent, Tuple[Any, ...]]]): Events already
+                emitted for the part of qss_text that has been parsed.
+        """
+        self._recorded_events = events
+        try:
+            resumable = self._parse_text(new_text)
+            self._store_parse_result(qss_text, events, resumable)
+        finally:
+            self._recorded_events = None
+
+    def _parse_text(self, qss_text: str) -> bool:
+        """
+        Run the plugins over every line of a QSS text.
+
+        Args:
+            qss_text (str): The QSS text to parse.
+
+        Returns:
+            bool: True if the text ended outside of any block or comment, so
+                text appended to it can be parsed on top of the current state.
+        """
+        if "/*" in qss_text:
+            qss_text = SelectorUtils.strip_block_comments(qss_text)
+        for match in Constants.COMPILED_LINE_PATTERN.finditer(qss_text):
+            self._process_line(match.group())
             self._state.current_line += 1
+        state = self._state
+        resumable = (
+            qss_text.endswith("\n")
+            and "/*" not in qss_text
+            and not state.in_rule
+            and not state.in_variables
+            and not state.in_comment
+            and not state.buffer_lines
+            and not state.variable_lines
+        )
         self._finalize_parsing()
-        self._logger.debug("Parsing completed and parse_completed event dispatched")
+        return resumable
+
+    def _store_parse_result(
+        self,
+        qss_text: str,
+        events: List[Tuple[ParserEvent, Tuple[Any, ...]]],
+        resumable: bool,
+    ) -> None:
+        """
+        Store a snapshot of the current parse result in the parse cache.
+
+        The rules are left out of the snapshot, since they may already have
+        been changed by handlers; they are rebuilt from the recorded events.
+
+        Args:
+            qss_text (str): The parsed QSS text, used as the cache key.
+            events (List[Tuple[ParserEvent, Tuple[Any, ...]]]): Events emitted
+                while parsing.
+            resumable (bool): Whether text appended to qss_text can be parsed
+                on top of the snapshot.
+        """
+        self._parse_cache[qss_text] = (
+            copy.deepcopy(replace(self._state, rules=[])),
+            dict(self._variable_manager._variables),
+            list(events),
+            resumable,
+        )
+        if len(self._parse_cache) > self._PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+
+    def _restore_parse_result(
+        self, cached: _ParseCacheEntry
+    ) -> List[Tuple[ParserEvent, Tuple[Any, ...]]]:
+        """
+        Restore a cached parse result and replay its events.
+
+        The rules are rebuilt by replaying the recorded rule_added events, so
+        handlers see and may change the parser's own rules exactly as in a
+        fresh parse, while the cached entry stays untouched.
+
+        Args:
+            cached (_ParseCacheEntry): The cached state, variables and events.
+
+        Returns:
+            List[Tuple[ParserEvent, Tuple[Any, ...]]]: A copy of the recorded
+                events, which text appended later can extend.
+        """
+        state, variables, events, _ = cached
+        self._state = copy.deepcopy(state)
+        self._variable_manager._variables = dict(variables)
+        self._rule_map = {}
+        self._replay_events(events)
+        return list(events)
+
+    def _replay_events(self, events: List[Tuple[ParserEvent, Tuple[Any, ...]]]) -> None:
+        """
+        Emit previously recorded parse events again.
+
+        Recorded rules are copied before they are handled, so the recorded
+        events can be replayed any number of times.
+
+        Args:
+            events (List[Tuple[ParserEvent, Tuple[Any, ...]]]): The events to emit.
+        """
+        for event, args in events:
+            if event is ParserEvent.RULE_ADDED:
+                self.handle_rule(copy.deepcopy(args[0]))
+            elif event is ParserEvent.ERROR_FOUND:
+                self.dispatch_error(*args)
+            else:
+                self._emit(event, *args)
 
     def _reset(self) -> None:
         """
@@ -1530,6 +2285,8 @@ class QSSParser:
         self._state.reset()
         self._variable_manager = VariableManager()
         self._rule_map.clear()
+        self._styles_cache.clear()
+        self._to_string_cache = None
         self._logger.debug("Parser state reset")
 
     def _process_line(self, line: str) -> None:
@@ -1564,25 +2321,25 @@ class QSSParser:
         """
         Finalize the parsing process.
 
-        This method handles any remaining state and dispatches the parse
-        completed event.
+        This method handles any remaining state left at the end of the text.
         """
-        if self._state.buffer.strip():
+        if self._state.buffer_lines:
+            buffer = " ".join(self._state.buffer_lines)
             try:
                 self._property_processor.process_property(
-                    self._state.buffer,
+                    buffer,
                     self._state.current_rules,
                     self._variable_manager,
                     self._state.current_line,
                 )
             except Exception as e:
                 self.dispatch_error(
-                    f"Error on line {self._state.current_line}: Invalid property: {self._state.buffer} ({str(e)})"
+                    f"Error on line {self._state.current_line}: Invalid property: {buffer} ({str(e)})"
                 )
 
-        if self._state.variable_buffer.strip():
+        if self._state.variable_lines:
             errors = self._variable_manager.parse_variables(
-                self._state.variable_buffer, self._state.current_line
+                " ".join(self._state.variable_lines), self._state.current_line
             )
             for error in errors:
                 self.dispatch_error(error)
@@ -1597,9 +2354,6 @@ class QSSParser:
             self._state.original_selector = None
             self._state.rule_start_line = 0
 
-        for handler in self._event_handlers[ParserEvent.PARSE_COMPLETED.value]:
-            handler()
-
     def get_styles_for(
         self,
         widget: WidgetProtocol,
@@ -1610,6 +2364,9 @@ class QSSParser:
         """
         Get the styles that apply to a widget.
 
+        Results are cached per object name, class name and arguments until
+        the parser parses new text or adds a rule, or one of its rules changes.
+
         Args:
             widget (WidgetProtocol): The widget to get styles for.
             fallback_class (Optional[str]): Fallback class name if no styles match.
@@ -1620,13 +2377,35 @@ class QSSParser:
         Returns:
             str: The combined styles that apply to the widget.
         """
-        return self._style_selector.get_styles_for(
+        object_name: str = widget.objectName()
+        class_name: str = widget.metaObject().className()
+        key: _StylesCacheKey = (
+            object_name,
+            class_name,
+            fallback_class,
+            tuple(additional_selectors or ()),
+            include_class_if_object_name,
+        )
+        if self._styles_version != self._rules_version:
+            self._styles_cache.clear()
+            self._style_selector._invalidate_index()
+            self._styles_version = self._rules_version
+        cached = self._styles_cache.get(key)
+        if cached is not None:
+            self._styles_cache.move_to_end(key)
+            return cached
+        styles = self._style_selector._get_styles_for_names(
             self._state.rules,
-            widget,
+            object_name,
+            class_name,
             fallback_class,
             additional_selectors,
             include_class_if_object_name,
         )
+        self._styles_cache[key] = styles
+        if len(self._styles_cache) > self._STYLES_CACHE_SIZE:
+            self._styles_cache.popitem(last=False)
+        return styles
 
     def __repr__(self) -> str:
         """
@@ -1641,13 +2420,24 @@ class QSSParser:
         """
         Convert all parsed rules to a formatted string.
 
+        The result is cached until the parser parses new text or adds a rule,
+        or one of its rules changes.
+
         Returns:
             str: The formatted QSS string.
         """
-        return "\n".join(
-            QSSFormatter.format_rule(rule.selector, rule.properties)
-            for rule in self._state.rules
-        )
+        if (
+            self._to_string_cache is None
+            or self._to_string_version != self._rules_version
+        ):
+            self._to_string_cache = "\n".join(
+                [rule.to_string() for rule in self._state.rules]
+            )
+            self._to_string_version = self._rules_version
+        return self._to_string_cache
+
+
+_IndexedSelector = Tuple[QSSRule, str, FrozenSet[str]]
 
 
 class QSSStyleSelector:
@@ -1659,6 +2449,13 @@ class QSSStyleSelector:
 
     Attributes:
         _logger (logging.Logger): Logger instance for debugging and error reporting.
+        _prefix_index (Dict[str, List[_IndexedSelector]]): Maps every prefix a
+            comma-separated selector can be looked up by (see _match_prefixes) to
+            the rules and selectors with that prefix, along with the selector's
+            compound names.
+        _indexed_rules (Optional[List[QSSRule]]): The rule list _prefix_index was
+            built from.
+        _indexed_count (int): Length of _indexed_rules when the index was built.
     """
 
     def __init__(self, logger: Optional[logging.Logger] = None) -> None:
@@ -1669,6 +2466,87 @@ class QSSStyleSelector:
             logger (Optional[logging.Logger]): Custom logger instance.
         """
         self._logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._prefix_index: Dict[str, List[_IndexedSelector]] = {}
+        self._indexed_rules: Optional[List[QSSRule]] = None
+        self._indexed_count: int = 0
+
+    @staticmethod
+    def _match_prefixes(selector: str) -> List[str]:
+        """
+        Get the selectors a selector is matched by in style lookups.
+
+        A lookup selector matches when the selector starts with it, followed
+        by a pseudo colon, space, attribute, child combinator or the end.
+
+        Args:
+            selector (str): The selector.
+
+        Returns:
+            List[str]: The matching prefixes, e.g. ["QPushButton",
+                "QPushButton:hover"] for "QPushButton:hover".
+        """
+        boundaries = Constants.SELECTOR_BOUNDARY_CHARS
+        prefixes = [
+            selector[:i] for i, char in enumerate(selector) if char in boundaries
+        ]
+        prefixes.append(selector)
+        return prefixes
+
+    @staticmethod
+    def _compound_names(selector: str) -> FrozenSet[str]:
+        """
+        Get the names of the compound selectors in a selector, without
+        attributes, pseudo-states or pseudo-elements.
+
+        Args:
+            selector (str): The selector.
+
+        Returns:
+            FrozenSet[str]: The compound names, e.g. {"QWidget", "QPushButton"} for
+                "QWidget > QPushButton:hover".
+        """
+        sel_without_attrs: str = Constants.COMPILED_ATTRIBUTE_PATTERN.sub(
+            "", selector
+        ).strip()
+        return frozenset(
+            part.split("::")[0].split(":")[0]
+            for part in sel_without_attrs.replace(">", " ").split()
+        )
+
+    def _get_prefix_index(
+        self, rules: List[QSSRule]
+    ) -> Dict[str, List[_IndexedSelector]]:
+        """
+        Get the prefix index for a rule list, rebuilding it if the list changed.
+
+        Rules are only ever appended to the parser's list, so the index is
+        rebuilt when a different list is passed or its length changed. The
+        parser also drops the index through _invalidate_index when one of its
+        rules changes, since a rule's selector may have been replaced.
+
+        Args:
+            rules (List[QSSRule]): List of all available rules.
+
+        Returns:
+            Dict[str, List[_IndexedSelector]]: The prefix index for the rules.
+        """
+        if self._indexed_rules is not rules or self._indexed_count != len(rules):
+            index: Dict[str, List[_IndexedSelector]] = {}
+            for rule in rules:
+                for sel in SelectorUtils.split_selectors(rule.selector):
+                    entry = (rule, sel, self._compound_names(sel))
+                    for prefix in self._match_prefixes(sel):
+                        index.setdefault(prefix, []).append(entry)
+            self._prefix_index = index
+            self._indexed_rules = rules
+            self._indexed_count = len(rules)
+        return self._prefix_index
+
+    def _invalidate_index(self) -> None:
+        """
+        Drop the prefix index, so it is rebuilt on the next lookup.
+        """
+        self._indexed_rules = None
 
     def get_styles_for(
         self,
@@ -1695,12 +2573,48 @@ class QSSStyleSelector:
         Returns:
             str: The combined styles that apply to the widget.
         """
-        object_name: str = widget.objectName()
-        class_name: str = widget.metaObject().className()
+        return self._get_styles_for_names(
+            rules,
+            widget.objectName(),
+            widget.metaObject().className(),
+            fallback_class,
+            additional_selectors,
+            include_class_if_object_name,
+        )
+
+    def _get_styles_for_names(
+        self,
+        rules: List[QSSRule],
+        object_name: str,
+        class_name: str,
+        fallback_class: Optional[str] = None,
+        additional_selectors: Optional[List[str]] = None,
+        include_class_if_object_name: bool = False,
+    ) -> str:
+        """
+        Get all styles that apply to a widget with the given names.
+
+        The widget is queried once by the caller, so its object and class
+        names are not looked up again while matching.
+
+        Args:
+            rules (List[QSSRule]): List of all available rules.
+            object_name (str): The object name of the widget.
+            class_name (str): The class name of the widget.
+            fallback_class (Optional[str]): Fallback class name if no styles match.
+            additional_selectors (Optional[List[str]]): Additional selectors to include.
+            include_class_if_object_name (bool): Whether to include class styles when
+                object name is present.
+
+        Returns:
+            str: The combined styles that apply to the widget.
+        """
         styles: Set[QSSRule] = set()
 
         self._logger.debug(
-            f"Retrieving styles for widget: objectName={object_name}, className={class_name}"
+            "Retrieving styles for widget: objectName=%s, className=%s",
+            object_name,
+            class_name,
         )
 
         if object_name:
@@ -1729,19 +2643,16 @@ class QSSStyleSelector:
             )
 
         if additional_selectors:
-            for selector in additional_selectors:
+            for selector in dict.fromkeys(additional_selectors):
                 styles.update(
                     self._get_rules_for_selector(
                         rules, selector, object_name, class_name
                     )
                 )
 
-        unique_styles = sorted(set(styles), key=lambda r: r.selector)
-        result = "\n".join(
-            QSSFormatter.format_rule(r.selector, r.properties).rstrip("\n")
-            for r in unique_styles
-        )
-        self._logger.debug(f"Styles retrieved: {result}")
+        unique_styles = sorted(styles, key=attrgetter("selector"))
+        result = "\n".join(r.to_string().rstrip("\n") for r in unique_styles)
+        self._logger.debug("Styles retrieved: %s", result)
         return result
 
     def _get_rules_for_selector(
@@ -1751,7 +2662,8 @@ class QSSStyleSelector:
         Get all rules that match a specific selector.
 
         This method handles complex selector matching, including attribute
-        selectors and combinators.
+        selectors and combinators. Selectors starting with the requested
+        selector are looked up directly in the prefix index.
 
         Args:
             rules (List[QSSRule]): List of all available rules.
@@ -1762,30 +2674,20 @@ class QSSStyleSelector:
         Returns:
             List[QSSRule]: List of matching rules.
         """
+        candidates = self._get_prefix_index(rules).get(selector)
+        if not candidates:
+            return []
+
         matching_rules: Set[QSSRule] = set()
-        escaped_selector: str = re.escape(selector)
-        pattern: Pattern[str] = re.compile(rf"^{escaped_selector}([: \[\>]|$|::)")
+        is_id_selector = selector.startswith("#")
+        id_selector = f"#{object_name}"
+        check_compound = not is_id_selector and selector != class_name
 
-        for rule in rules:
-            rule_selectors: List[str] = [s.strip() for s in rule.selector.split(",")]
-            for sel in rule_selectors:
-                if pattern.search(sel):
-                    if selector.startswith("#") and f"#{object_name}" not in sel:
-                        continue
-                    if not selector.startswith("#") and selector != class_name:
-                        sel_without_attrs: str = (
-                            Constants.COMPILED_ATTRIBUTE_PATTERN.sub("", sel).strip()
-                        )
-                        parts: List[str] = [
-                            part.strip()
-                            for part in re.split(r"[> ]+", sel_without_attrs)
-                            if part.strip()
-                        ]
-                        if not any(
-                            part.split("::")[0].split(":")[0] == selector
-                            for part in parts
-                        ):
-                            continue
-                    matching_rules.add(rule)
+        for rule, sel, compound_names in candidates:
+            if is_id_selector and id_selector not in sel:
+                continue
+            if check_compound and selector not in compound_names:
+                continue
+            matching_rules.add(rule)
 
         return list(matching_rules)
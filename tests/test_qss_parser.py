@@ -1,3 +1,5 @@
+import copy
+import dataclasses
 import logging
 import os
 import sys
@@ -6,9 +8,48 @@ from typing import Any, List, Set, Tuple
 from unittest.mock import Mock
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
-from qss_parser import ParserEvent, QSSParser, QSSRule
+from qss_parser import (
+    ParserEvent,
+    ParserState,
+    QSSParser,
+    QSSProperty,
+    QSSRule,
+    SelectorUtils,
+)
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.environ.get("QSS_PARSER_LOG_LEVEL", "WARNING"))
+
+
+class FakeMetaObject:
+    """
+    Minimal meta object exposing the class name of a FakeWidget.
+    """
+
+    __slots__ = ("_class_name",)
+
+    def __init__(self, class_name: str) -> None:
+        self._class_name = class_name
+
+    def className(self) -> str:
+        return self._class_name
+
+
+class FakeWidget:
+    """
+    Minimal widget implementing WidgetProtocol, cheaper to build than a Mock.
+    """
+
+    __slots__ = ("_object_name", "_meta_object")
+
+    def __init__(self, object_name: str, class_name: str) -> None:
+        self._object_name = object_name
+        self._meta_object = FakeMetaObject(class_name)
+
+    def objectName(self) -> str:
+        return self._object_name
+
+    def metaObject(self) -> FakeMetaObject:
+        return self._meta_object
 
 
 class TestQSSParserParsing(unittest.TestCase):
@@ -632,16 +673,150 @@ class TestQSSParserParsing(unittest.TestCase):
         self.assertEqual(rule.properties[3].value, "10px")
         self.assertEqual(self.errors, [], "Single-line rule should produce no errors")
 
+    def test_parse_multiple_inline_comments_in_line(self) -> None:
+        """
+        Test parsing lines with several inline comments and an unterminated one.
+        """
+        qss: str = """
+        QPushButton /* first */ { /* second */
+            color: /* inline */ red; /* trailing */
+        }
+        """
+        self.parser.parse(qss)
+        self.assertEqual(len(self.parser._state.rules), 1)
+        rule: QSSRule = self.parser._state.rules[0]
+        self.assertEqual(rule.selector, "QPushButton")
+        self.assertEqual(rule.properties[0].name, "color")
+        self.assertEqual(rule.properties[0].value, "red")
+        self.assertEqual(self.errors, [], "Inline comments should produce no errors")
+        self.assertEqual(
+            SelectorUtils.strip_comments("color: red; /* a */ /* unterminated"),
+            "color: red;  /* unterminated",
+        )
+
+    def test_parse_multi_line_comment_inside_rule(self) -> None:
+        """
+        Test that a comment spanning lines inside a rule keeps line numbers.
+        """
+        qss: str = """
+        QPushButton {
+            color: red; /* this comment
+            spans lines */ background: white;
+            border: none
+            font-size: 12px;
+        }
+        """
+        self.parser.parse(qss)
+        self.assertEqual(len(self.parser._state.rules), 1)
+        rule: QSSRule = self.parser._state.rules[0]
+        self.assertEqual(
+            [(p.name, p.value) for p in rule.properties],
+            [("color", "red"), ("background", "white"), ("font-size", "12px")],
+        )
+        self.assertEqual(
+            self.errors, ["Error on line 5: Property missing ';': border: none"]
+        )
+
+    def test_parse_windows_line_endings_line_numbers(self) -> None:
+        """
+        Test that CRLF line endings keep error line numbers accurate.
+        """
+        qss: str = "QPushButton {\r\n    color: blue\r\n    background: white;\r\n}\r\n"
+        self.parser.parse(qss)
+        self.assertEqual(len(self.parser._state.rules), 1)
+        self.assertEqual(
+            self.errors, ["Error on line 2: Property missing ';': color: blue"]
+        )
+
+    def test_parse_same_invalid_qss_twice_reports_errors_each_time(self) -> None:
+        """
+        Test that re-parsing the same QSS reports selector errors again.
+        """
+        qss: str = """
+        QPushButton:invalid {
+            color: red;
+        }
+        """
+        self.parser.parse(qss)
+        first_errors: List[str] = list(self.errors)
+        self.errors.clear()
+        self.parser.parse(qss)
+        self.assertEqual(len(first_errors), 1, "Should report invalid pseudo-state")
+        self.assertEqual(self.errors, first_errors, "Errors should be reported again")
+        errors: List[str] = SelectorUtils.validate_selector_syntax(
+            "QPushButton:invalid", 2
+        )
+        errors.append("mutated")
+        self.assertEqual(
+            SelectorUtils.validate_selector_syntax("QPushButton:invalid", 2),
+            first_errors,
+            "Returned error lists should not share cached state",
+        )
+
+    def test_validate_selector_syntax_cached_across_lines(self) -> None:
+        """
+        Test that cached selector validation reports the requested line number.
+        """
+        first: List[str] = SelectorUtils.validate_selector_syntax("QLabel:unknown", 2)
+        hits: int = SelectorUtils._validate_selector_syntax.cache_info().hits
+        second: List[str] = SelectorUtils.validate_selector_syntax("QLabel:unknown", 7)
+        self.assertEqual(
+            SelectorUtils._validate_selector_syntax.cache_info().hits, hits + 1
+        )
+        self.assertTrue(first[0].startswith("Error on line 2: Invalid pseudo-state"))
+        self.assertEqual(second, [error.replace("line 2", "line 7") for error in first])
+
+    def test_normalize_selector_spacing(self) -> None:
+        """
+        Test selector normalization of combinators, class-id pairs and attributes.
+        """
+        self.assertEqual(
+            SelectorUtils.normalize_selector(
+                'QFrame>QPushButton#ok[text="a  >  b"]:hover,  QLabel\t#title'
+            ),
+            'QFrame > QPushButton #ok[text="a  >  b"]:hover, QLabel #title',
+        )
+        self.assertEqual(
+            SelectorUtils.normalize_selector("a#b#c > > d"), "a #b#c > > d"
+        )
+
+    def test_parser_state_buffer_alias(self) -> None:
+        """
+        Test that ParserState.buffer reads and replaces buffer_lines.
+        """
+        state: ParserState = ParserState()
+        state.buffer = "color:"
+        self.assertEqual(state.buffer_lines, ["color:"])
+        state.buffer_lines.append("red;")
+        self.assertEqual(state.buffer, "color: red;")
+        state.buffer = ""
+        self.assertEqual(state.buffer_lines, [])
+
+    def test_parser_state_variable_buffer_alias(self) -> None:
+        """
+        Test that ParserState.variable_buffer reads and replaces variable_lines.
+        """
+        state: ParserState = ParserState()
+        state.variable_buffer = "--color: red;"
+        self.assertEqual(state.variable_lines, ["--color: red;"])
+        state.variable_lines.append("--size: 2px;")
+        self.assertEqual(state.variable_buffer, "--color: red; --size: 2px;")
+        state.variable_buffer = ""
+        self.assertEqual(state.variable_lines, [])
+
 
 class TestQSSParserStyleSelection(unittest.TestCase):
-    def setUp(self) -> None:
+    qss: str
+    widget: FakeWidget
+    widget_no_name: FakeWidget
+    widget_no_qss: FakeWidget
+
+    @classmethod
+    def setUpClass(cls) -> None:
         """
-        Set up the test environment for style selection tests.
+        Set up the QSS text and widgets shared by all style selection tests.
         """
-        self.parser: QSSParser = QSSParser()
-        self.errors: List[str] = []
-        self.parser.on(ParserEvent.ERROR_FOUND, lambda error: self.errors.append(error))
-        self.qss: str = """
+        cls.qss = """
         #myButton {
             color: red;
         }
@@ -665,18 +840,22 @@ class TestQSSParserStyleSelection(unittest.TestCase):
             border-radius: 5px;
         }
         """
+        cls.widget = FakeWidget("myButton", "QPushButton")
+        cls.widget_no_name = FakeWidget("", "QScrollBar")
+        cls.widget_no_qss = FakeWidget("verticalScrollBar", "QScrollBar")
+
+    def setUp(self) -> None:
+        """
+        Set up a parser for each test.
+
+        Tests register handlers and re-parse, so each gets its own parser.
+        Parsing the shared QSS after the first test is served by the parse
+        cache.
+        """
+        self.parser: QSSParser = QSSParser()
+        self.errors: List[str] = []
+        self.parser.on(ParserEvent.ERROR_FOUND, lambda error: self.errors.append(error))
         self.parser.parse(self.qss)
-        self.widget: Mock = Mock()
-        self.widget.objectName.return_value = "myButton"
-        self.widget.metaObject.return_value.className.return_value = "QPushButton"
-        self.widget_no_name: Mock = Mock()
-        self.widget_no_name.objectName.return_value = ""
-        self.widget_no_name.metaObject.return_value.className.return_value = (
-            "QScrollBar"
-        )
-        self.widget_no_qss: Mock = Mock()
-        self.widget_no_qss.objectName.return_value = "verticalScrollBar"
-        self.widget_no_qss.metaObject.return_value.className.return_value = "QScrollBar"
 
     def test_get_styles_for_object_name(self) -> None:
         """
@@ -686,7 +865,7 @@ class TestQSSParserStyleSelection(unittest.TestCase):
         expected: str = """#myButton {
     color: red;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             self.errors, [], "Valid style retrieval should produce no errors"
         )
@@ -703,7 +882,7 @@ class TestQSSParserStyleSelection(unittest.TestCase):
 QScrollBar:vertical {
     background: lightgray;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             self.errors, [], "Valid style retrieval should produce no errors"
         )
@@ -720,7 +899,7 @@ QScrollBar:vertical {
 QScrollBar:vertical {
     background: lightgray;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             self.errors, [], "Valid style retrieval should produce no errors"
         )
@@ -738,7 +917,7 @@ QScrollBar:vertical {
 QPushButton {
     background: blue;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             self.errors, [], "Valid style retrieval should produce no errors"
         )
@@ -753,20 +932,18 @@ QPushButton {
         expected: str = """#myButton {
     color: red;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_fallback_class_when_without_object_name(self) -> None:
         """
         Test style retrieval with a fallback class when no object name is provided.
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "oiiio"
-        widget.metaObject.return_value.className.return_value = "QFrame"
+        widget: FakeWidget = FakeWidget("oiiio", "QFrame")
         stylesheet: str = self.parser.get_styles_for(widget, fallback_class="QWidget")
         expected: str = """QFrame {
     border: 1px solid black;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_fallback_class_when_without_object_name_and_class(
         self,
@@ -774,14 +951,12 @@ QPushButton {
         """
         Test style retrieval with a fallback class when neither object name nor class has styles.
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "oiiio"
-        widget.metaObject.return_value.className.return_value = "Ola"
+        widget: FakeWidget = FakeWidget("oiiio", "Ola")
         stylesheet: str = self.parser.get_styles_for(widget, fallback_class="QWidget")
         expected: str = """QWidget {
     font-size: 12px;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_additional_selectors(self) -> None:
         """
@@ -799,7 +974,7 @@ QPushButton {
 QFrame {
     border: 1px solid black;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_all_parameters(self) -> None:
         """
@@ -820,7 +995,7 @@ QFrame {
 QPushButton {
     background: blue;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_invalid_selector(self) -> None:
         """
@@ -832,7 +1007,7 @@ QPushButton {
         expected: str = """#myButton {
     color: red;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_composite_selector(self) -> None:
         """
@@ -848,9 +1023,7 @@ QPushButton {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QScrollBar"
+        widget: FakeWidget = FakeWidget("", "QScrollBar")
         stylesheet: str = parser.get_styles_for(widget)
         expected: str = """QScrollBar QWidget {
     margin: 5px;
@@ -858,7 +1031,7 @@ QPushButton {
 QScrollBar:vertical QWidget {
     padding: 2px;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_multiple_selectors(self) -> None:
         """
@@ -871,14 +1044,12 @@ QScrollBar:vertical QWidget {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QScrollBar"
+        widget: FakeWidget = FakeWidget("", "QScrollBar")
         stylesheet: str = parser.get_styles_for(widget)
         expected: str = """QScrollBar {
     color: green;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_fallback_class_and_additional_selectors(self) -> None:
         """
@@ -893,7 +1064,7 @@ QScrollBar:vertical QWidget {
 QFrame {
     border: 1px solid black;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_include_class_and_additional_selectors(self) -> None:
         """
@@ -913,7 +1084,7 @@ QFrame {
 QPushButton {
     background: blue;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_with_class_additional_selectors_and_special_selectors_and_include_class_if_object_name_false(
         self,
@@ -959,9 +1130,7 @@ QPushButton {
             color: gray;
         }
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "qScrollArea"
-        widget.metaObject.return_value.className.return_value = "QScrollArea"
+        widget: FakeWidget = FakeWidget("qScrollArea", "QScrollArea")
         parser = QSSParser()
         parser.parse(qss)
         stylesheet: str = parser.get_styles_for(
@@ -983,9 +1152,8 @@ QPushButton:pressed {
 }
 QPushButton[select="True"] {
     font-weight: bold;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_with_class_additional_selectors_and_special_selectors_and_include_class_if_object_name_true(
         self,
@@ -1031,9 +1199,7 @@ QPushButton[select="True"] {
             color: gray;
         }
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "qScrollArea"
-        widget.metaObject.return_value.className.return_value = "QScrollArea"
+        widget: FakeWidget = FakeWidget("qScrollArea", "QScrollArea")
         parser = QSSParser()
         parser.parse(qss)
         stylesheet: str = parser.get_styles_for(
@@ -1068,9 +1234,8 @@ QScrollArea:hover {
 }
 QScrollArea[select="True"] {
     color: white;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_with_class_additional_selectors_and_special_selectors_and_without_class_name(
         self,
@@ -1116,9 +1281,7 @@ QScrollArea[select="True"] {
             color: gray;
         }
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QScrollArea"
+        widget: FakeWidget = FakeWidget("", "QScrollArea")
         parser = QSSParser()
         parser.parse(qss)
         stylesheet: str = parser.get_styles_for(
@@ -1149,9 +1312,8 @@ QScrollArea:hover {
 }
 QScrollArea[select="True"] {
     color: white;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_with_class_additional_selectors_and_special_selectors_and_fallback_class(
         self,
@@ -1200,9 +1362,7 @@ QScrollArea[select="True"] {
             color: gray;
         }
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "qFrame"
-        widget.metaObject.return_value.className.return_value = "QFrame"
+        widget: FakeWidget = FakeWidget("qFrame", "QFrame")
         parser = QSSParser()
         parser.parse(qss)
         stylesheet: str = parser.get_styles_for(
@@ -1232,9 +1392,8 @@ QScrollArea:hover {
 }
 QScrollArea[another="False"] {
     color: white;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_with_class_additional_selectors_and_special_selectors_and_fallback_class_with_duplicates(
         self,
@@ -1302,9 +1461,7 @@ QScrollArea[another="False"] {
             color: gray;
         }
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "qFrame"
-        widget.metaObject.return_value.className.return_value = "QFrame"
+        widget: FakeWidget = FakeWidget("qFrame", "QFrame")
         parser = QSSParser()
         parser.parse(qss)
         stylesheet: str = parser.get_styles_for(
@@ -1342,39 +1499,34 @@ QScrollArea:hover {
 }
 QScrollArea[another="False"] {
     color: white;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_object_name_no_rules(self) -> None:
         """
         Test style retrieval for an object name with no rules, including class styles.
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "nonExistentButton"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("nonExistentButton", "QPushButton")
         stylesheet: str = self.parser.get_styles_for(
             widget, include_class_if_object_name=True
         )
         expected: str = """QPushButton {
     background: blue;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_object_name_no_rules_with_include_class_false(self) -> None:
         """
         Test style retrieval for an object name with no rules, including class styles.
         """
-        widget: Mock = Mock()
-        widget.objectName.return_value = "nonExistentButton"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("nonExistentButton", "QPushButton")
         stylesheet: str = self.parser.get_styles_for(
             widget, include_class_if_object_name=False
         )
         expected: str = """QPushButton {
     background: blue;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_fallback_class_no_rules(self) -> None:
         """
@@ -1386,7 +1538,7 @@ QScrollArea[another="False"] {
         expected: str = """#myButton {
     color: red;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_mixed_additional_selectors(self) -> None:
         """
@@ -1401,7 +1553,36 @@ QScrollArea[another="False"] {
 QFrame {
     border: 1px solid black;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
+
+    def test_get_styles_for_queries_widget_once(self) -> None:
+        """
+        Test that style retrieval reads the widget's names once per call.
+        """
+        widget: Mock = Mock(wraps=self.widget)
+        self.parser.get_styles_for(
+            widget,
+            fallback_class="QWidget",
+            additional_selectors=["QFrame"],
+            include_class_if_object_name=True,
+        )
+        self.assertEqual(widget.objectName.call_count, 1)
+        self.assertEqual(widget.metaObject.call_count, 1)
+
+    def test_get_styles_for_repeated_additional_selectors(self) -> None:
+        """
+        Test style retrieval with repeated and empty additional selectors.
+        """
+        stylesheet: str = self.parser.get_styles_for(
+            self.widget, additional_selectors=["QFrame", "", "QFrame", "#missing"]
+        )
+        expected: str = """#myButton {
+    color: red;
+}
+QFrame {
+    border: 1px solid black;
+}"""
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_pseudo_state_combination(self) -> None:
         """
@@ -1414,14 +1595,12 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
         expected: str = """QPushButton:hover:focus {
     color: green;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_pseudo_element_selector(self) -> None:
         """
@@ -1434,14 +1613,12 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QScrollBar"
+        widget: FakeWidget = FakeWidget("", "QScrollBar")
         stylesheet: str = parser.get_styles_for(widget)
         expected: str = """QScrollBar::handle {
     background: darkgray;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_empty_qss_with_parameters(self) -> None:
         """
@@ -1449,9 +1626,7 @@ QFrame {
         """
         parser: QSSParser = QSSParser()
         parser.parse("")
-        widget: Mock = Mock()
-        widget.objectName.return_value = "myButton"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("myButton", "QPushButton")
         stylesheet: str = parser.get_styles_for(
             widget,
             fallback_class="QWidget",
@@ -1460,6 +1635,107 @@ QFrame {
         )
         self.assertEqual(stylesheet, "", "Empty QSS should return empty stylesheet")
 
+    def test_get_styles_for_after_reparse_uses_new_rules(self) -> None:
+        """
+        Test style retrieval after the same parser parses different QSS.
+        """
+        self.assertIn("color: red;", self.parser.get_styles_for(self.widget))
+        qss: str = """
+        #myButton {
+            color: green;
+        }
+        QPushButton:hover {
+            color: white;
+        }
+        """
+        self.parser.parse(qss)
+        stylesheet: str = self.parser.get_styles_for(
+            self.widget, include_class_if_object_name=True
+        )
+        expected: str = """#myButton {
+    color: green;
+}
+QPushButton:hover {
+    color: white;
+}"""
+        self.assertEqual(stylesheet, expected)
+
+    def test_get_styles_for_repeated_call_refreshed_by_parse(self) -> None:
+        """
+        Test that repeated style retrieval is refreshed when new QSS is parsed.
+        """
+        first: str = self.parser.get_styles_for(self.widget)
+        self.assertEqual(self.parser.get_styles_for(self.widget), first)
+        self.parser.parse("#myButton { color: green; }")
+        self.assertEqual(
+            self.parser.get_styles_for(self.widget),
+            "#myButton {\n    color: green;\n}",
+        )
+
+    def test_get_styles_for_after_parsed_rule_changes(self) -> None:
+        """
+        Test that style retrieval reflects changes made to a parsed rule.
+        """
+        parser: QSSParser = QSSParser()
+        parser.parse("QLabel #title { color: blue; }")
+        widget: FakeWidget = FakeWidget("title", "QLabel")
+        self.assertEqual(
+            parser.get_styles_for(widget), "QLabel #title {\n    color: blue;\n}"
+        )
+        rule: QSSRule = parser._state.rules[0]
+        rule.add_property("border", "none")
+        self.assertEqual(
+            parser.get_styles_for(widget),
+            "QLabel #title {\n    color: blue;\n    border: none;\n}",
+        )
+        rule.merge_properties([QSSProperty("color", "red")])
+        self.assertEqual(
+            parser.get_styles_for(widget),
+            "QLabel #title {\n    color: red;\n    border: none;\n}",
+        )
+
+    def test_get_styles_for_cache_kept_after_unrelated_changes(self) -> None:
+        """
+        Test that cached styles survive changes to rules of other parsers.
+        """
+        parser: QSSParser = QSSParser()
+        parser.parse("QLabel { color: blue; }")
+        widget: FakeWidget = FakeWidget("", "QLabel")
+        styles: str = parser.get_styles_for(widget)
+        QSSRule("QFrame").add_property("color", "red")
+        other: QSSParser = QSSParser()
+        other.parse("QFrame { color: red; }")
+        other._state.rules[0].add_property("border", "none")
+        self.assertIs(parser.get_styles_for(widget), styles)
+
+    def test_selector_index_kept_after_unrelated_changes(self) -> None:
+        """
+        Test that the selector index is not rebuilt for changes to other rules.
+        """
+        parser: QSSParser = QSSParser()
+        parser.parse("QLabel { color: blue; }\nQFrame { margin: 0; }")
+        parser.get_styles_for(FakeWidget("", "QLabel"))
+        index = parser._style_selector._prefix_index
+        other: QSSParser = QSSParser()
+        other.parse("QFrame { color: red; }")
+        other._state.rules[0].selector = "QLabel"
+        self.assertEqual(
+            parser.get_styles_for(FakeWidget("", "QFrame")),
+            "QFrame {\n    margin: 0;\n}",
+        )
+        self.assertIs(parser._style_selector._prefix_index, index)
+
+    def test_get_styles_for_after_selector_change(self) -> None:
+        """
+        Test that style retrieval follows a rule whose selector is reassigned.
+        """
+        parser: QSSParser = QSSParser()
+        parser.parse("QCheckBox { color: blue; }")
+        label: FakeWidget = FakeWidget("", "QLabel")
+        self.assertEqual(parser.get_styles_for(label), "")
+        parser._state.rules[0].selector = "QLabel"
+        self.assertEqual(parser.get_styles_for(label), "QLabel {\n    color: blue;\n}")
+
     def test_get_styles_for_duplicate_rules(self) -> None:
         """
         Test style retrieval with duplicate rules.
@@ -1474,15 +1750,13 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
         expected: str = """QPushButton {
     color: blue;
     background: white;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
 
     def test_get_styles_for_missing_closing_brace(self) -> None:
         """
@@ -1494,9 +1768,7 @@ QFrame {
             color: blue;
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
         self.assertEqual(
             stylesheet, "", "Incomplete QSS should return empty stylesheet"
@@ -1513,11 +1785,9 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
-        self.assertEqual(stylesheet.strip(), "")
+        self.assertEqual(stylesheet, "")
 
     def test_get_styles_for_complex_nested_selector(self) -> None:
         """
@@ -1530,12 +1800,10 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
 
-        self.assertEqual(stylesheet.strip(), "")
+        self.assertEqual(stylesheet, "")
 
     def test_get_styles_for_complex_selector(self) -> None:
         """
@@ -1548,11 +1816,9 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
-        self.assertEqual(stylesheet.strip(), "")
+        self.assertEqual(stylesheet, "")
 
     def test_get_styles_for_selector_with_extra_spaces(self) -> None:
         """
@@ -1565,11 +1831,9 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
-        self.assertEqual(stylesheet.strip(), "")
+        self.assertEqual(stylesheet, "")
 
     def test_get_styles_for_attribute_selector(self) -> None:
         """
@@ -1589,15 +1853,13 @@ QFrame {
         self.assertEqual(
             parser._state.rules[0].selector, '#btn_save[selected="true"]:hover'
         )
-        widget: Mock = Mock()
-        widget.objectName.return_value = "btn_save"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("btn_save", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
         expected: str = """#btn_save[selected="true"]:hover {
     border-left: 22px solid qlineargradient(spread:pad, x1:0.034, y1:0, x2:0.216, y2:0, stop:0.499 rgba(255, 121, 198, 255), stop:0.5 rgba(85, 170, 255, 0));
     background-color: rgb(98, 114, 164);
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             errors, [], "Valid attribute selector should produce no errors"
         )
@@ -1622,9 +1884,7 @@ QFrame {
         }
         """
         parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = ""
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("", "QPushButton")
         stylesheet: str = parser.get_styles_for(widget)
         expected: str = """QPushButton {
     color: #ff0000;
@@ -1632,7 +1892,7 @@ QFrame {
     background: white;
     border: 1px solid black;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             errors, [], "Valid variables and properties should produce no errors"
         )
@@ -1651,9 +1911,7 @@ QFrame {
         errors: List[str] = []
         self.parser.on(ParserEvent.ERROR_FOUND, lambda error: errors.append(error))
         self.parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = "extraCloseColumnBtn"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("extraCloseColumnBtn", "QPushButton")
         stylesheet: str = self.parser.get_styles_for(widget)
 
         expected: str = """#extraCloseColumnBtn QPushButton {
@@ -1661,9 +1919,8 @@ QFrame {
     border: none;
     border-radius: 14px;
     color: #ffffff;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             errors, [], "Valid variables and properties should produce no errors"
         )
@@ -1678,18 +1935,15 @@ QFrame {
         errors: List[str] = []
         self.parser.on(ParserEvent.ERROR_FOUND, lambda error: errors.append(error))
         self.parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = "extraCloseColumnBtn"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("extraCloseColumnBtn", "QPushButton")
         stylesheet: str = self.parser.get_styles_for(widget)
         expected: str = """#extraCloseColumnBtn {
     background-color: rgba(248, 248, 242, 0);
     border: none;
     border-radius: 14px;
     color: #ffffff;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             errors, [], "Valid variables and properties should produce no errors"
         )
@@ -1711,18 +1965,15 @@ QFrame {
         errors: List[str] = []
         self.parser.on(ParserEvent.ERROR_FOUND, lambda error: errors.append(error))
         self.parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = "anyButton"
-        widget.metaObject.return_value.className.return_value = "QCheckBox"
+        widget: FakeWidget = FakeWidget("anyButton", "QCheckBox")
         stylesheet: str = self.parser.get_styles_for(widget)
         expected: str = """#anyButton QCheckBox::drop-down:disabled {
     color: red;
     width: 15px;
     height: 15px;
     border-radius: 10px;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             errors,
             [],
@@ -1749,18 +2000,15 @@ QFrame {
         errors: List[str] = []
         self.parser.on(ParserEvent.ERROR_FOUND, lambda error: errors.append(error))
         self.parser.parse(qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = "anyButton"
-        widget.metaObject.return_value.className.return_value = "QCheckBox"
+        widget: FakeWidget = FakeWidget("anyButton", "QCheckBox")
         stylesheet: str = self.parser.get_styles_for(widget)
         expected: str = """#anyButton QCheckBox::drop-down:disabled {
     color: red;
     width: 15px;
     height: 15px;
     border-radius: 10px;
-}
-"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+}"""
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             errors,
             [],
@@ -1797,6 +2045,22 @@ class TestQSSParserEvents(unittest.TestCase):
         self.assertEqual(selectors, {"QPushButton", "#myButton"})
         self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
 
+    def test_event_rule_added_with_pseudo_state(self) -> None:
+        """
+        Test that a pseudo-state rule is added and reported once.
+        """
+        rules_added: List[str] = []
+        self.parser.on(
+            ParserEvent.RULE_ADDED, lambda rule: rules_added.append(rule.selector)
+        )
+        self.parser.parse("QPushButton:hover { color: red; color: blue; }")
+        self.assertEqual(rules_added, ["QPushButton:hover"])
+        self.assertEqual(
+            self.parser.get_styles_for(FakeWidget("", "QPushButton")),
+            "QPushButton:hover {\n    color: red;\n    color: blue;\n}",
+        )
+        self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
+
     def test_event_error_found(self) -> None:
         """
         Test the error_found event with a missing semicolon.
@@ -1831,6 +2095,23 @@ class TestQSSParserEvents(unittest.TestCase):
         )
         self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
 
+    def test_handler_registered_during_event(self) -> None:
+        """
+        Test that a handler registered by another handler sees later events only.
+        """
+        late_rules: List[str] = []
+
+        def register_late_handler(rule: QSSRule) -> None:
+            if rule.selector == "QPushButton":
+                self.parser.on(
+                    ParserEvent.RULE_ADDED,
+                    lambda added: late_rules.append(added.selector),
+                )
+
+        self.parser.on(ParserEvent.RULE_ADDED, register_late_handler)
+        self.parser.parse(self.qss)
+        self.assertEqual(late_rules, ["#myButton"])
+
     def test_event_error_found_multiple(self) -> None:
         """
         Test multiple handlers for the error_found event.
@@ -1896,6 +2177,194 @@ class TestQSSParserEvents(unittest.TestCase):
         self.assertTrue(parse_completed, "Should trigger parse_completed")
         self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
 
+    def test_events_replayed_when_reparsing_same_qss(self) -> None:
+        """
+        Test that parsing the same QSS again emits the same events.
+        """
+        qss: str = """
+        @variables {
+            --color: blue;
+        }
+        QPushButton {
+            color: var(--color)
+            background: white;
+        }
+        #myButton {
+            font-size: 12px;
+        }
+        """
+        runs: List[Tuple[List[str], List[str], List[Tuple[str, str]]]] = []
+        for _ in range(2):
+            parser: QSSParser = QSSParser()
+            rules_added: List[str] = []
+            errors: List[str] = []
+            variables: List[Tuple[str, str]] = []
+            parser.on(
+                ParserEvent.RULE_ADDED, lambda rule: rules_added.append(rule.selector)
+            )
+            parser.on(ParserEvent.ERROR_FOUND, lambda error: errors.append(error))
+            parser.on(
+                ParserEvent.VARIABLE_DEFINED,
+                lambda name, value: variables.append((name, value)),
+            )
+            parser.parse(qss)
+            parser._state.rules[0].add_property("border", "none")
+            runs.append((rules_added, errors, variables))
+        self.assertEqual(runs[0], runs[1], "Re-parsing should replay the same events")
+        self.assertEqual(runs[1][0], ["QPushButton", "#myButton"])
+        self.assertEqual(len(runs[1][1]), 1, "Missing semicolon should be reported")
+        self.assertEqual(runs[1][2], [("--color", "blue")])
+        self.assertEqual(
+            [p.name for p in parser._state.rules[0].properties],
+            ["background", "border"],
+            "Mutating parsed rules should not affect later parses",
+        )
+        self.assertEqual(self.errors, [], "Unused parser should produce no errors")
+
+    def test_merge_into_rule_restored_from_parse_cache(self) -> None:
+        """
+        Test that rules restored from the parse cache merge independently.
+        """
+        qss: str = "QPushButton { color: blue; }"
+        first: QSSParser = QSSParser()
+        first.parse(qss)
+        self.assertEqual(first.to_string(), "QPushButton {\n    color: blue;\n}\n")
+        second: QSSParser = QSSParser()
+        second.parse(qss)
+        self.assertEqual(second.to_string(), first.to_string())
+        rule = QSSRule("QPushButton")
+        rule.add_property("color", "red")
+        second.handle_rule(rule)
+        self.assertEqual(second.to_string(), "QPushButton {\n    color: red;\n}\n")
+        self.assertEqual(first.to_string(), "QPushButton {\n    color: blue;\n}\n")
+
+    def test_parse_appended_text_matches_full_parse(self) -> None:
+        """
+        Test that parsing appended or unchanged text matches a full parse.
+        """
+        first: str = (
+            "@variables {\n    --color: blue;\n}\nQPushButton { color: red; }\n"
+        )
+        second: str = (
+            first
+            + "QPushButton { border: none; }\n#myButton { color: var(--color); }\n"
+        )
+        rules_added: List[str] = []
+        self.parser.on(
+            ParserEvent.RULE_ADDED, lambda rule: rules_added.append(rule.selector)
+        )
+        self.parser.parse(first)
+        self.parser.parse(second)
+        self.assertEqual(
+            rules_added, ["QPushButton", "QPushButton", "QPushButton", "#myButton"]
+        )
+        rules_added.clear()
+        self.parser.parse(second)
+        self.assertEqual(rules_added, ["QPushButton", "QPushButton", "#myButton"])
+        QSSParser.clear_parse_cache()
+        full: QSSParser = QSSParser()
+        full.parse(second)
+        self.assertEqual(self.parser.to_string(), full.to_string())
+        self.assertEqual(
+            self.parser.to_string(),
+            "QPushButton {\n    color: red;\n    border: none;\n}\n\n"
+            "#myButton {\n    color: blue;\n}\n",
+        )
+        self.assertEqual(self.errors, [])
+
+    def test_parse_cache_isolated_from_mutating_handler(self) -> None:
+        """
+        Test that a handler changing rules does not leak through the parse cache.
+        """
+        qss: str = "QPushButton { color: red; }\nQPushButton { margin: 0; }\n"
+        QSSParser.clear_parse_cache()
+        seen: List[str] = []
+
+        def add_border(rule: QSSRule) -> None:
+            seen.append(rule.to_string())
+            rule.add_property("padding", str(len(seen)))
+
+        self.parser.on(ParserEvent.RULE_ADDED, add_border)
+        self.parser.parse(qss)
+        first_seen: List[str] = list(seen)
+        other: QSSParser = QSSParser()
+        other.parse(qss)
+        self.assertEqual(
+            other.to_string(),
+            "QPushButton {\n    color: red;\n    margin: 0;\n}\n",
+        )
+        seen.clear()
+        self.parser.parse(qss)
+        self.assertEqual(seen, first_seen)
+        self.assertEqual(seen[0], "QPushButton {\n    color: red;\n}\n")
+        self.assertEqual(
+            self.parser.to_string(),
+            "QPushButton {\n    color: red;\n    padding: 1;\n    margin: 0;\n"
+            "    padding: 2;\n}\n",
+        )
+
+    def test_parse_cache_skips_subclasses(self) -> None:
+        """
+        Test that a subclass overriding handle_rule does not share the parse cache.
+        """
+
+        class TaggingParser(QSSParser):
+            def handle_rule(self, rule: QSSRule) -> None:
+                rule.add_property("x-tag", "1")
+                super().handle_rule(rule)
+
+        qss: str = "QLabel { color: red; }\n"
+        tagged: str = "QLabel {\n    color: red;\n    x-tag: 1;\n}\n"
+        QSSParser.clear_parse_cache()
+        first: TaggingParser = TaggingParser()
+        first.parse(qss)
+        self.assertEqual(first.to_string(), tagged)
+        plain: QSSParser = QSSParser()
+        plain.parse(qss)
+        self.assertEqual(plain.to_string(), "QLabel {\n    color: red;\n}\n")
+        second: TaggingParser = TaggingParser()
+        second.parse(qss)
+        self.assertEqual(second.to_string(), tagged)
+
+    def test_parse_cache_opt_out(self) -> None:
+        """
+        Test that a parser created with use_parse_cache=False bypasses the cache.
+        """
+        qss: str = "QLabel { color: red; }\n"
+        QSSParser.clear_parse_cache()
+        parser: QSSParser = QSSParser(use_parse_cache=False)
+        parser.parse(qss)
+        self.assertNotIn(qss, QSSParser._parse_cache)
+        self.assertEqual(parser.to_string(), "QLabel {\n    color: red;\n}\n")
+
+    def test_parse_same_text_after_rule_change(self) -> None:
+        """
+        Test that parsing the same text again discards changes made to rules.
+        """
+        qss: str = "QPushButton { color: red; }\n"
+        self.parser.parse(qss)
+        self.parser._state.rules[0].add_property("border", "none")
+        self.parser.parse(qss)
+        self.assertEqual(self.parser.to_string(), "QPushButton {\n    color: red;\n}\n")
+
+    def test_parse_same_text_with_mutating_handler(self) -> None:
+        """
+        Test that a handler changing rules applies its change once per parse.
+        """
+        first: str = "QPushButton { color: red; }\n"
+        self.parser.on(
+            ParserEvent.RULE_ADDED, lambda rule: rule.add_property("border", "none")
+        )
+        expected: str = "QPushButton {\n    color: red;\n    border: none;\n}\n"
+        self.parser.parse(first)
+        self.parser.parse(first)
+        self.assertEqual(self.parser.to_string(), expected)
+        self.parser.parse(first + "QLabel { color: blue; }\n")
+        self.assertEqual(
+            self.parser.to_string(),
+            expected + "\nQLabel {\n    color: blue;\n    border: none;\n}\n",
+        )
+
 
 class TestQSSParserToString(unittest.TestCase):
     def setUp(self) -> None:
@@ -1940,6 +2409,198 @@ class TestQSSParserToString(unittest.TestCase):
         self.assertEqual(self.parser.to_string(), expected)
         self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
 
+    def test_to_string_merges_repeated_selector_last_value_wins(self) -> None:
+        """
+        Test to_string() merges repeated selectors keeping first-seen order.
+        """
+        qss = """
+        QPushButton {
+            color: blue;
+            border: none;
+        }
+        QPushButton {
+            background: white;
+            color: red;
+        }
+        """
+        self.parser.parse(qss)
+        expected = (
+            "QPushButton {\n    color: red;\n    border: none;\n"
+            "    background: white;\n}\n"
+        )
+        self.assertEqual(self.parser.to_string(), expected)
+        self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
+
+    def test_rule_to_string_reflects_property_changes(self) -> None:
+        """
+        Test QSSRule.to_string() after properties are added and merged.
+        """
+        rule = QSSRule("QPushButton")
+        rule.add_property("color", "blue")
+        self.assertEqual(rule.to_string(), "QPushButton {\n    color: blue;\n}\n")
+        rule.add_property("border", "none")
+        other = QSSRule("QPushButton")
+        other.add_property("color", "red")
+        rule.merge_properties(other.properties)
+        self.assertEqual(
+            rule.to_string(), "QPushButton {\n    color: red;\n    border: none;\n}\n"
+        )
+
+    def test_to_string_after_parsed_rule_changes(self) -> None:
+        """
+        Test that to_string() reflects changes made to a parsed rule.
+        """
+        self.parser.parse("QFrame { color: blue; }")
+        self.assertEqual(self.parser.to_string(), "QFrame {\n    color: blue;\n}\n")
+        rule: QSSRule = self.parser._state.rules[0]
+        rule.add_property("border", "none")
+        self.assertEqual(
+            self.parser.to_string(),
+            "QFrame {\n    color: blue;\n    border: none;\n}\n",
+        )
+        rule.properties[0] = QSSProperty("color", "red")
+        rule.mark_changed()
+        self.assertEqual(
+            self.parser.to_string(), "QFrame {\n    color: red;\n    border: none;\n}\n"
+        )
+
+    def test_to_string_cache_kept_after_unrelated_changes(self) -> None:
+        """
+        Test that cached to_string() output survives changes to other rules.
+        """
+        self.parser.parse("QFrame { color: blue; }\nQLabel { margin: 0; }")
+        output: str = self.parser.to_string()
+        other: QSSParser = QSSParser()
+        other.parse("QLabel { color: red; }")
+        other._state.rules[0].add_property("border", "none")
+        self.assertIs(self.parser.to_string(), output)
+
+    def test_rule_to_string_reflects_direct_changes(self) -> None:
+        """
+        Test QSSRule.to_string() after the selector or properties are changed.
+        """
+        rule = QSSRule("QPushButton")
+        rule.add_property("color", "blue")
+        self.assertEqual(rule.to_string(), "QPushButton {\n    color: blue;\n}\n")
+        rule.selector = "QLabel"
+        self.assertEqual(rule.to_string(), "QLabel {\n    color: blue;\n}\n")
+        rule.properties[0] = QSSProperty("color", "red")
+        rule.mark_changed()
+        self.assertEqual(rule.to_string(), "QLabel {\n    color: red;\n}\n")
+        del rule.properties[0]
+        rule.mark_changed()
+        self.assertEqual(rule.to_string(), "QLabel {\n\n}\n")
+
+    def test_merge_properties_with_maintained_name_index(self) -> None:
+        """
+        Test merge_properties() between properties added with add_property().
+        """
+        rule = QSSRule("QLabel")
+        rule.add_property("color", "red")
+        rule.add_property("color", "blue")
+        rule.merge_properties([QSSProperty("margin", "0")])
+        rule.add_property("border", "none")
+        rule.merge_properties(
+            [QSSProperty("border", "1px solid black"), QSSProperty("color", "green")]
+        )
+        self.assertEqual(
+            [(p.name, p.value) for p in rule.properties],
+            [("color", "green"), ("margin", "0"), ("border", "1px solid black")],
+        )
+
+    def test_merge_properties_after_in_place_replacement(self) -> None:
+        """
+        Test merge_properties() after a property is replaced in the list directly.
+        """
+        rule = QSSRule("QLabel")
+        rule.add_property("color", "red")
+        rule.add_property("border", "none")
+        rule.merge_properties([QSSProperty("border", "1px solid black")])
+        rule.properties[0] = QSSProperty("margin", "0")
+        rule.mark_changed()
+        rule.merge_properties([QSSProperty("color", "blue")])
+        self.assertEqual(
+            [(p.name, p.value) for p in rule.properties],
+            [("margin", "0"), ("border", "1px solid black"), ("color", "blue")],
+        )
+
+    def test_rule_copy_with_slots(self) -> None:
+        """
+        Test that slotted QSSRule instances copy independently.
+        """
+        rule = QSSRule("QPushButton:hover")
+        rule.add_property("color", "blue")
+        self.assertFalse(hasattr(rule, "__dict__"))
+        clone = copy.deepcopy(rule)
+        clone.add_property("border", "none")
+        self.assertEqual(clone.pseudo_states, ["hover"])
+        self.assertEqual(rule.to_string(), "QPushButton:hover {\n    color: blue;\n}\n")
+        self.assertEqual(
+            clone.to_string(),
+            "QPushButton:hover {\n    color: blue;\n    border: none;\n}\n",
+        )
+
+    def test_property_is_immutable_and_hashable(self) -> None:
+        """
+        Test that QSSProperty values are immutable and usable in sets.
+        """
+        prop = QSSProperty(" color ", " red ")
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            prop.value = "blue"  # type: ignore[misc]
+        self.assertEqual({prop, QSSProperty("color", "red")}, {prop})
+        self.assertIs(copy.deepcopy(prop), prop)
+
+    def test_to_string_with_redefined_variable(self) -> None:
+        """
+        Test to_string() when a variable is redefined after being used.
+        """
+        qss = """
+        @variables {
+            --color: red;
+        }
+        QLabel {
+            color: var(--color);
+        }
+        @variables {
+            --color: blue;
+        }
+        QFrame {
+            color: var(--color);
+        }
+        """
+        self.parser.parse(qss)
+        expected = "QLabel {\n    color: red;\n}\n\nQFrame {\n    color: blue;\n}\n"
+        self.assertEqual(self.parser.to_string(), expected)
+        self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
+
+    def test_to_string_with_redefined_nested_variable(self) -> None:
+        """
+        Test to_string() when a variable used through another one is redefined.
+        """
+        qss = """
+        @variables {
+            --base: red;
+            --accent: var(--base);
+        }
+        QLabel {
+            color: var(--accent);
+            border: 1px solid var(--accent);
+        }
+        @variables {
+            --base: blue;
+        }
+        QFrame {
+            color: var(--accent);
+        }
+        """
+        self.parser.parse(qss)
+        expected = (
+            "QLabel {\n    color: red;\n    border: 1px solid red;\n}\n\n"
+            "QFrame {\n    color: blue;\n}\n"
+        )
+        self.assertEqual(self.parser.to_string(), expected)
+        self.assertEqual(self.errors, [], "Valid QSS should produce no errors")
+
     def test_to_string_with_variables(self) -> None:
         """
         Test to_string() with a QSS rule using variables.
@@ -2470,16 +3131,14 @@ class TestQSSParserQProperty(unittest.TestCase):
         Test style retrieval for a widget with qproperty attributes.
         """
         self.parser.parse(self.qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = "customButton"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("customButton", "QPushButton")
 
         stylesheet: str = self.parser.get_styles_for(widget)
         expected: str = """#customButton {
     qproperty-enabled: false;
     background: gray;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             self.errors, [], "Valid qproperty style retrieval should produce no errors"
         )
@@ -2489,9 +3148,7 @@ class TestQSSParserQProperty(unittest.TestCase):
         Test style retrieval including class styles for a widget with qproperty attributes.
         """
         self.parser.parse(self.qss)
-        widget: Mock = Mock()
-        widget.objectName.return_value = "customButton"
-        widget.metaObject.return_value.className.return_value = "QPushButton"
+        widget: FakeWidget = FakeWidget("customButton", "QPushButton")
 
         stylesheet: str = self.parser.get_styles_for(
             widget, include_class_if_object_name=True
@@ -2505,7 +3162,7 @@ QPushButton {
     qproperty-text: "Click Me";
     color: blue;
 }"""
-        self.assertEqual(stylesheet.strip(), expected.strip())
+        self.assertEqual(stylesheet, expected)
         self.assertEqual(
             self.errors, [], "Valid qproperty style retrieval should produce no errors"
         )
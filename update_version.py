@@ -5,10 +5,17 @@ import tomlkit
 from pathlib import Path
 from typing import Optional
 
+_VERSION_RE = re.compile(r"^\d+\.\d+\.\d+$")
+_INIT_VERSION_RE = re.compile(r'__version__ = ["\'](.*?)["\']')
+_PYPROJECT_VERSION_RE = re.compile(
+    r'^(\[project\][ \t]*\r?\n(?:(?!\[)[^\n]*\n)*?version[ \t]*=[ \t]*)"[^"]*"',
+    re.MULTILINE,
+)
+
 
 def validate_version(version: str) -> None:
     """Validates that the version follows MAJOR.MINOR.PATCH format."""
-    if not re.match(r"^\d+\.\d+\.\d+$", version):
+    if not _VERSION_RE.match(version):
         raise ValueError("Version must be in MAJOR.MINOR.PATCH format (e.g., 0.1.0)")
 
 
@@ -22,15 +29,23 @@ def update_pyproject_version(filepath: Path, new_version: str) -> None:
     shutil.copy(filepath, filepath.with_suffix(filepath.suffix + ".bak"))
 
     with filepath.open("r", encoding="utf-8") as f:
-        data = tomlkit.parse(f.read())
+        content = f.read()
 
-    if "project" not in data or "version" not in data["project"]:
-        raise KeyError("Invalid pyproject.toml: missing 'project.version' field")
+    # Edit the version line in place; only parse the TOML if it isn't found
+    new_content, count = _PYPROJECT_VERSION_RE.subn(
+        lambda match: f'{match.group(1)}"{new_version}"', content, count=1
+    )
+    if not count:
+        data = tomlkit.parse(content)
 
-    data["project"]["version"] = new_version
+        if "project" not in data or "version" not in data["project"]:
+            raise KeyError("Invalid pyproject.toml: missing 'project.version' field")
+
+        data["project"]["version"] = new_version
+        new_content = tomlkit.dumps(data)
 
     with filepath.open("w", encoding="utf-8") as f:
-        f.write(tomlkit.dumps(data))
+        f.write(new_content)
     print(f"Updated {filepath} to version {new_version}")
 
 
@@ -40,17 +55,20 @@ def update_init_version(filepath: Path, new_version: str) -> None:
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
 
-    # Create a backup of the file
-    shutil.copy(filepath, filepath.with_suffix(filepath.suffix + ".bak"))
-
     with filepath.open("r", encoding="utf-8") as f:
         content = f.read()
 
-    pattern = r'__version__ = ["\'].*?["\']'
-    if not re.search(pattern, content):
+    match = _INIT_VERSION_RE.search(content)
+    if not match:
         raise ValueError(f"No __version__ found in {filepath}")
+    if match.group(1) == new_version:
+        print(f"Version {new_version} already set in {filepath}, skipping update")
+        return
 
-    new_content = re.sub(pattern, f'__version__ = "{new_version}"', content)
+    # Create a backup of the file
+    shutil.copy(filepath, filepath.with_suffix(filepath.suffix + ".bak"))
+
+    new_content = _INIT_VERSION_RE.sub(f'__version__ = "{new_version}"', content)
 
     with filepath.open("w", encoding="utf-8") as f:
         f.write(new_content)
@@ -67,6 +85,16 @@ def get_current_version(filepath: Path) -> Optional[str]:
     return data.get("project", {}).get("version")
 
 
+def get_current_init_version(filepath: Path) -> Optional[str]:
+    """Reads the current version from __init__.py."""
+    filepath = Path(filepath)
+    if not filepath.exists():
+        return None
+    with filepath.open("r", encoding="utf-8") as f:
+        match = _INIT_VERSION_RE.search(f.read())
+    return match.group(1) if match else None
+
+
 def main() -> None:
     """Main function to update version in pyproject.toml and __init__.py."""
     if len(sys.argv) != 2:
@@ -81,17 +109,18 @@ def main() -> None:
         pyproject_file = Path("pyproject.toml")
         init_file = Path("src/qss_parser/__init__.py")
 
-        # Check if current version matches the new version
+        # Check if current versions match the new version
         current_version = get_current_version(pyproject_file)
-        if current_version == new_version:
-            print(
-                f"Version {new_version} already set in pyproject.toml, skipping update"
-            )
+        current_init_version = get_current_init_version(init_file)
+        if current_version == new_version and current_init_version == new_version:
+            print(f"Version {new_version} already set, skipping update")
             return
 
-        # Update files
-        update_pyproject_version(pyproject_file, new_version)
-        update_init_version(init_file, new_version)
+        # Update files that are not at the new version yet
+        if current_version != new_version:
+            update_pyproject_version(pyproject_file, new_version)
+        if current_init_version != new_version:
+            update_init_version(init_file, new_version)
 
     except (ValueError, FileNotFoundError, KeyError) as e:
         print(f"Error: {e}")